@@ -0,0 +1,69 @@
+"""
+Quantization Benchmark (bench_quantize.py)
+------------------------------------------
+Compares float64 / float32 / float16 / int8 taste-vector matrices on:
+- memory per vector
+- top-K scoring (one query against every user)
+- max observed score error vs float64, next to the documented bound
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.bench.bench_quantize --users 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.quantize import QuantizedVectors, score_error_bound
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    part = np.argpartition(scores, -k)[-k:]
+    return part[np.argsort(-scores[part])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=12)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    m64 = rng.standard_normal((args.users, args.dim))
+    m64 /= np.linalg.norm(m64, axis=1, keepdims=True)
+    m32 = m64.astype(np.float32)
+    query64 = m64[0]
+    exact = m64 @ query64
+
+    print(f"users: {args.users:,}  dim: {args.dim}  k: {args.k}")
+    print(f"{'format':8} {'B/vector':>9} {'MB':>8} {'top-k ms':>9} {'max err':>10} {'bound':>9}")
+
+    ms = _best_ms(lambda: _top_k(m64 @ query64, args.k), args.repeat)
+    print(f"{'float64':8} {m64.nbytes / args.users:9.0f} {m64.nbytes / 1e6:8.1f} {ms:9.2f} {0:10.2e} {'-':>9}")
+    ms = _best_ms(lambda: _top_k(m32 @ m32[0], args.k), args.repeat)
+    err = np.abs(m32 @ m32[0] - exact).max()
+    print(f"{'float32':8} {m32.nbytes / args.users:9.0f} {m32.nbytes / 1e6:8.1f} {ms:9.2f} {err:10.2e} {'-':>9}")
+
+    for mode in ("float16", "int8"):
+        qv = QuantizedVectors.from_matrix(m32, mode)
+        query = m32[0]
+        ms = _best_ms(lambda: qv.top_k(query, args.k), args.repeat)
+        err = np.abs(qv.scores(query) - exact).max()
+        bound = score_error_bound(mode, args.dim)
+        print(f"{mode:8} {qv.nbytes / args.users:9.0f} {qv.nbytes / 1e6:8.1f} {ms:9.2f} {err:10.2e} {bound:9.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Recommendation Job Scaling Benchmark (bench_recommend.py)
+---------------------------------------------------------
+Times jobs.recommend.compute_top_n (the all-pairs scoring step) on random
+taste vectors for several worker counts. No database is needed.
+
+Work is O(N^2 * dim): 1M users is ~100x the 100k run, so expect minutes per
+core at that size.
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.bench.bench_recommend --users 100000 --workers 1 2 4 8
+            python -m backend.bench.bench_recommend --users 1000000 --workers 8 16 32
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from backend.jobs.recommend import compute_top_n
+from backend.services.score import unit_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=12)
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--block-rows", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = unit_rows(rng.random((args.users, args.dim), dtype=np.float32))
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    base = None
+    print(f"users: {args.users:,}  dim: {args.dim}  top-n: {args.top_n}  cores available: {cores}")
+    if max(args.workers) > cores:
+        print(f"WARNING: only {cores} core(s) available; runs with more workers can't show scaling")
+    for workers in args.workers:
+        start = time.perf_counter()
+        compute_top_n(matrix, args.top_n, workers, args.block_rows)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"workers {workers:3d}: {elapsed:8.2f} s   speedup {base / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
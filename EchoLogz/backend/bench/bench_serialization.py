@@ -0,0 +1,123 @@
+"""
+Serialization Benchmark (bench_serialization.py)
+------------------------------------------------
+Measures GET /users/ for N users end to end (DB read -> JSON bytes), from the
+same in-memory SQLite table, and splits the win into its two sources.
+
+Pipelines (each timed in full, query included):
+- baseline      : db.query(User).all() -> response_model=list[UserOut]
+                  validates once (from_attributes) -> model_dump(json) -> json.dumps
+                  (what list_users_endpoint did before FAST_JSON)
+- proj+validate : crud.list_users_projected (Row._asdict()) -> UserOut per row
+                  -> stdlib json   (FAST_JSON off, orjson not installed)
+- proj+json     : crud.list_users_projected -> stdlib json   (no validation)
+- proj+orjson   : crud.list_users_projected -> orjson        (FAST_JSON on)
+
+Stage timings are printed too, so the effect of skipping validation
+(EmailStr dominates it) is reported apart from the effect of orjson.
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.bench.bench_serialization --users 10000
+"""
+
+import argparse
+import json
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.echoDB import db_crud as crud
+from backend.echoDB.db_schemas import Base, User
+from backend.echoDB.db_validation import UserOut
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _session(n: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(insert(User), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "$2b$12$" + "x" * 53}
+        for i in range(1, n + 1)
+    ])
+    db.commit()
+    return db
+
+
+def _stdlib_json(content) -> bytes:
+    # JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = _session(args.users)
+    adapter = TypeAdapter(list[UserOut])
+
+    def load_orm():
+        db.expunge_all()  # no identity-map hits: every run builds fresh ORM objects
+        return db.query(User).all()
+
+    def validate_orm(rows):
+        return adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+
+    def validate_dicts(rows):
+        return [UserOut.model_validate(row).model_dump(mode="json") for row in rows]
+
+    pipelines = {
+        "baseline":      lambda: _stdlib_json(validate_orm(load_orm())),
+        "proj+validate": lambda: _stdlib_json(validate_dicts(crud.list_users_projected(db))),
+        "proj+json":     lambda: _stdlib_json(crud.list_users_projected(db)),
+    }
+    if orjson is not None:
+        pipelines["proj+orjson"] = lambda: orjson.dumps(crud.list_users_projected(db))
+
+    orm_rows, dict_rows = load_orm(), crud.list_users_projected(db)
+    validated = validate_dicts(dict_rows)
+    stages = {
+        "load ORM rows":        lambda: load_orm(),
+        "load projection":      lambda: crud.list_users_projected(db),
+        "validate ORM rows":    lambda: validate_orm(orm_rows),
+        "validate dicts":       lambda: validate_dicts(dict_rows),
+        "encode stdlib json":   lambda: _stdlib_json(validated),
+    }
+    if orjson is not None:
+        stages["encode orjson"] = lambda: orjson.dumps(validated)
+
+    print(f"users: {args.users}  (best of {args.repeat}, ms)")
+    print("pipelines:")
+    totals = {name: _best_of(fn, args.repeat) for name, fn in pipelines.items()}
+    for name, ms in totals.items():
+        print(f"  {name:14} {ms:9.2f}   {totals['baseline'] / ms:6.1f}x vs baseline")
+    print("stages:")
+    for name, fn in stages.items():
+        print(f"  {name:20} {_best_of(fn, args.repeat):9.2f}")
+    print("effects:")
+    print(f"  skip validation  {totals['proj+validate'] / totals['proj+json']:6.1f}x  (proj+validate -> proj+json)")
+    if orjson is not None:
+        print(f"  orjson           {totals['proj+json'] / totals['proj+orjson']:6.1f}x  (proj+json -> proj+orjson)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Admission Control Load Test (load_admission.py)
+-----------------------------------------------
+Shows that a spike on a heavy route no longer drags down cheap routes.
+
+Setup (in-process, no server or DB needed):
+- /match/compare  -> sync route, sleeps HEAVY_MS (stands in for scoring / bcrypt,
+                     both of which hold a threadpool thread)
+- /users/{id}     -> sync route, returns immediately (cheap read)
+
+Each run is open-loop (requests start on a timer, not after the previous
+reply): a heavy spike above the threadpool's capacity plus a steady trickle
+of cheap requests. We report cheap-route p50/p99 and how many heavy
+requests were shed (503).
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.bench.load_admission --heavy-rate 1000 --duration 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from backend.core.admission import AdmissionController, AdmissionControlMiddleware
+
+HEAVY_MS = 200  # ~ one bcrypt(12) verify
+
+
+def _build_app(with_admission: bool) -> tuple[FastAPI, AdmissionController]:
+    match = APIRouter(prefix="/match", tags=["match"])
+    users = APIRouter(prefix="/users", tags=["users"])
+
+    @match.post("/compare")
+    def compare():
+        time.sleep(HEAVY_MS / 1000)
+        return {"score": 0.5}
+
+    @users.get("/{user_id}")
+    def get_user(user_id: int):
+        return {"id": user_id}
+
+    app = FastAPI()
+    app.include_router(match)
+    app.include_router(users)
+    controller = AdmissionController(limits={"tag:match": (4, 64)}, max_wait=2.0)
+    if with_admission:
+        app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    return app, controller
+
+
+async def _open_loop(fire, rate: float, duration: float) -> list:
+    """Start fire() `rate` times/sec for `duration` seconds, without waiting on replies."""
+    tasks, interval = [], 1.0 / rate
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        tasks.append(asyncio.create_task(fire()))
+        await asyncio.sleep(interval)
+    return await asyncio.gather(*tasks)
+
+
+async def _run(with_admission: bool, heavy_rate: float, cheap_rate: float, duration: float):
+    app, controller = _build_app(with_admission)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/users/1")  # warm up
+
+        async def cheap():
+            start = time.perf_counter()
+            await client.get("/users/1")
+            return (time.perf_counter() - start) * 1000
+
+        async def heavy():
+            return (await client.post("/match/compare")).status_code
+
+        heavy_codes, latencies = [], []
+        if heavy_rate:
+            heavy_codes, latencies = await asyncio.gather(
+                _open_loop(heavy, heavy_rate, duration),
+                _open_loop(cheap, cheap_rate, duration),
+            )
+        else:
+            latencies = await _open_loop(cheap, cheap_rate, duration)
+
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    shed = sum(code == 503 for code in heavy_codes)
+    label = "with admission control" if with_admission else "no admission control  "
+    print(f"{label}: cheap p50 {statistics.median(latencies):8.2f} ms | "
+          f"p99 {p99:8.2f} ms | heavy shed {shed}/{len(heavy_codes)}")
+    if with_admission:
+        print(f"    metrics: {controller.snapshot()['bulkheads']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--heavy-rate", type=float, default=1000, help="heavy req/s during the spike")
+    parser.add_argument("--cheap-rate", type=float, default=100, help="cheap req/s")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds")
+    args = parser.parse_args()
+
+    asyncio.run(_run(False, 0, args.cheap_rate, args.duration))  # baseline: no spike
+    asyncio.run(_run(False, args.heavy_rate, args.cheap_rate, args.duration))
+    asyncio.run(_run(True, args.heavy_rate, args.cheap_rate, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Admission Control (admission.py)
+--------------------------------
+Per-route / per-tag concurrency limits with bounded wait queues, load
+shedding, and optional per-user token-bucket rate limits.
+
+Core Responsibilities:
+- Map each request to a "bulkhead" (by route path template or router tag)
+- Let at most `limit` requests of a bulkhead run at once; up to `queue` more wait
+- Shed load fast: 503 + Retry-After when the queue is full or the wait times out
+- Optionally rate-limit each caller (verified JWT subject, else client IP): 429 + Retry-After
+- Keep counters (active, waiting, admitted, rejected) for /metrics/admission
+
+Why:
+Every sync route shares one threadpool. A burst of CPU-heavy /match/compare
+or bcrypt-bound /auth/login calls can take every thread, and cheap reads
+like /users/{id} or /auth/me queue behind them. Capping the heavy bulkheads
+BEFORE they reach the threadpool keeps the cheap routes' latency flat.
+
+Typical Usage Example (main.py):
+    from backend.core.admission import AdmissionController, AdmissionControlMiddleware
+
+    admission = AdmissionController(
+        limits={"tag:match": (4, 16), "path:/auth/login": (8, 32)},
+        rate_per_min=120, burst=20,
+        identify=r_auth.token_subject,  # verified JWT sub, None if invalid
+    )
+    app.add_middleware(AdmissionControlMiddleware, controller=admission)
+"""
+
+import asyncio
+import math
+import time
+from typing import Callable
+
+from starlette.responses import JSONResponse
+from starlette.routing import compile_path
+
+
+# ------------------------------------------------------------------
+# Building blocks
+# ------------------------------------------------------------------
+class Bulkhead:
+    """A concurrency limit plus a bounded wait queue."""
+
+    def __init__(self, name: str, limit: int, queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.max_wait = max_wait
+        self._sem = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False means shed (queue full or waited too long)."""
+        if self._sem.locked() and self.waiting >= self.queue:
+            self.rejected += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._sem.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit, "queue": self.queue,
+            "active": self.active, "waiting": self.waiting,
+            "admitted": self.admitted, "rejected": self.rejected,
+        }
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/sec, holds at most `burst`."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: int):
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, rate: float, burst: int) -> float:
+        """Spend one token. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+# ------------------------------------------------------------------
+# Controller (shared state; survives Starlette rebuilding the middleware stack)
+# ------------------------------------------------------------------
+class AdmissionController:
+    """
+    limits: {"tag:<tag>" | "path:<route path template>": (limit, queue)}
+            path keys win over tag keys; unmatched routes are not limited.
+    rate_per_min: per-caller requests/minute (0 disables rate limiting).
+    identify: bearer token -> verified subject (None if invalid). Without it,
+              or when the token is missing/invalid, callers are keyed by client IP;
+              an unverified header is never a key (rotating it would dodge the limit).
+    """
+
+    MAX_BUCKETS = 100_000  # cap memory; oldest callers are forgotten first
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[int, int]],
+        max_wait: float = 5.0,
+        retry_after: int = 1,
+        rate_per_min: int = 0,
+        burst: int = 20,
+        identify: Callable[[str], str | None] | None = None,
+    ):
+        self.bulkheads = {
+            key: Bulkhead(key, limit, queue, max_wait) for key, (limit, queue) in limits.items()
+        }
+        self.retry_after = retry_after
+        self.rate = rate_per_min / 60.0
+        self.burst = burst
+        self.identify = identify
+        self.buckets: dict[str, TokenBucket] = {}
+        self.rate_limited = 0
+        self._routes: list | None = None
+        self._route_cache: dict[tuple[str, str], Bulkhead | None] = {}
+
+    def _route_table(self, app) -> list:
+        """[(method, path regex, path template, tags)] built once from the OpenAPI schema.
+
+        The schema is FastAPI's stable, public view of every route's path + tags
+        (router internals differ between FastAPI versions).
+        """
+        if self._routes is None:
+            table = []
+            for template, operations in app.openapi().get("paths", {}).items():
+                regex, _, _ = compile_path(template)
+                for method, op in operations.items():
+                    table.append((method.upper(), regex, template, op.get("tags", [])))
+            self._routes = table
+        return self._routes
+
+    def bulkhead_for(self, scope) -> Bulkhead | None:
+        """Resolve the request's route (path template + tags) to a bulkhead."""
+        cache_key = (scope["method"], scope["path"])
+        if cache_key in self._route_cache:
+            return self._route_cache[cache_key]
+        found = None
+        for method, regex, template, tags in self._route_table(scope["app"]):
+            if method == scope["method"] and regex.match(scope["path"]):
+                found = self.bulkheads.get(f"path:{template}")
+                for tag in tags:
+                    found = found or self.bulkheads.get(f"tag:{tag}")
+                break
+        if len(self._route_cache) < 10_000:  # concrete paths (/users/7) are unbounded
+            self._route_cache[cache_key] = found
+        return found
+
+    def check_rate(self, scope) -> float:
+        """0 if the caller may proceed, else seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+        key = self._caller_key(scope)
+        bucket = self.buckets.pop(key, None) or TokenBucket(self.burst)
+        self.buckets[key] = bucket  # re-insert = most recently used
+        if len(self.buckets) > self.MAX_BUCKETS:
+            self.buckets.pop(next(iter(self.buckets)))
+        wait = bucket.take(self.rate, self.burst)
+        if wait:
+            self.rate_limited += 1
+        return wait
+
+    def _caller_key(self, scope) -> str:
+        if self.identify is not None:
+            for name, value in scope.get("headers", []):
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    subject = self.identify(token.strip()) if scheme.lower() == "bearer" else None
+                    if subject:
+                        return "user:" + subject
+                    break
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def snapshot(self) -> dict:
+        return {
+            "bulkheads": {key: b.snapshot() for key, b in self.bulkheads.items()},
+            "rate_limited": self.rate_limited,
+            "tracked_callers": len(self.buckets),
+        }
+
+
+# ------------------------------------------------------------------
+# ASGI middleware
+# ------------------------------------------------------------------
+class AdmissionControlMiddleware:
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        wait = self.controller.check_rate(scope)
+        if wait:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"}, status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            return await response(scope, receive, send)
+
+        bulkhead = self.controller.bulkhead_for(scope)
+        if bulkhead is None:
+            return await self.app(scope, receive, send)
+
+        if not await bulkhead.acquire():
+            response = JSONResponse(
+                {"detail": "Server busy, try again shortly"}, status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after)},
+            )
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            bulkhead.release()
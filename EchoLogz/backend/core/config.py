@@ -34,6 +34,12 @@ class Settings(BaseSettings):
     SPOTIFY_REDIRECT_URI: str
     JWT_SECRET: str
 
+    # Performance toggles (all opt-in)
+    FAST_JSON: bool = False  # orjson responses + column projection, skips response_model revalidation
+    ADMISSION_CONTROL: bool = False  # per-route concurrency limits + load shedding (see core/admission.py)
+    RATE_LIMIT_PER_MIN: int = 0      # per-caller token bucket; 0 = off
+    RATE_LIMIT_BURST: int = 20
+
     class Config:
         env_file = ".env"  # Optional redundancy, Pydantic can use this too
 
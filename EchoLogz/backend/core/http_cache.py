@@ -0,0 +1,155 @@
+"""
+HTTP Conditional GET + Rendered-Response Cache (http_cache.py)
+--------------------------------------------------------------
+Lets read endpoints answer "you already have it" (304) from a tiny
+version lookup, and serve repeat renders from memory.
+
+Core Responsibilities:
+- Build strong ETags from a resource's identity + version (db_schemas.User.version)
+- Format Last-Modified from updated_at
+- Decide 304 from If-None-Match (or If-Modified-Since when no ETag was sent)
+- Keep a per-worker LRU of rendered JSON bodies: ONE entry per resource
+  ("users", "user-7"), tagged with the ETag it was rendered for, and bounded
+  by total bytes. A new version replaces the old body instead of piling up.
+
+Typical Usage Example (inside a router):
+    stamp = crud.get_user_stamp(db, user_id)             # (version, updated_at) only
+    return conditional_json(
+        request,
+        etag=strong_etag("user", user_id, stamp.version, stamp.updated_at),
+        last_modified=stamp.updated_at,
+        render=lambda: crud.get_user_projected(db, user_id),  # only on a miss
+        cache_key=f"user-{user_id}",
+    )
+
+Only pass last_modified when its timestamp moves on EVERY change to the
+representation (a collection's max(updated_at) does not move on a delete).
+
+"""
+
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from threading import Lock
+from typing import Any, Callable
+
+from fastapi import Request, Response, status
+
+from backend.core.responses import render_json
+
+CACHE_CONTROL = "private, no-cache"  # per-user data; always revalidate (cheap 304)
+RENDER_CACHE_BYTES = 64 * 1024 * 1024  # per worker
+
+
+# ------------------------------------------------------------------
+# Validators
+# ------------------------------------------------------------------
+def _utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; we always store UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+def strong_etag(*parts) -> str:
+    """Quoted strong ETag; long parts (or chars not allowed in an ETag) are hashed.
+    datetimes become epoch microseconds, so a recycled id + same version still differs."""
+    raw = "-".join(
+        str(int(_utc(p).timestamp() * 1_000_000)) if isinstance(p, datetime) else str(p)
+        for p in parts
+    )
+    if len(raw) > 64 or not raw.isascii() or " " in raw or '"' in raw:
+        raw = hashlib.sha1(raw.encode()).hexdigest()
+    return f'"{raw}"'
+
+def http_date(dt: datetime | None) -> str | None:
+    if dt is None:
+        return None
+    return format_datetime(_utc(dt).astimezone(timezone.utc), usegmt=True)
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:  # RFC 9110: If-None-Match wins over If-Modified-Since
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+# ------------------------------------------------------------------
+# Rendered-response cache (per worker process)
+# ------------------------------------------------------------------
+class RenderedCache:
+    """Thread-safe LRU: resource key -> (ETag, rendered JSON bytes), capped by total bytes."""
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._data: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, etag: str) -> bytes | None:
+        """The cached body, only if it was rendered for this exact ETag."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)  # a newer version replaces, never accumulates
+            if old is not None:
+                self.nbytes -= len(old[1])
+            if len(body) > self.max_bytes // 4:  # one huge body must not flush everything else
+                return
+            self._data[key] = (etag, body)
+            self.nbytes += len(body)
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+rendered_cache = RenderedCache()
+
+
+# ------------------------------------------------------------------
+# Response builder
+# ------------------------------------------------------------------
+def conditional_json(
+    request: Request,
+    etag: str,
+    last_modified: datetime | None,
+    render: Callable[[], Any],
+    cache_key: str,
+) -> Response:
+    """304 if the client is current; else cached bytes; else render() + cache.
+
+    cache_key names the resource (not the version): endpoints returning the same
+    representation share it, e.g. GET /users/{id} and /auth/me use "user-<id>".
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = rendered_cache.get(cache_key, etag)
+    if body is None:
+        body = render_json(render())
+        rendered_cache.put(cache_key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
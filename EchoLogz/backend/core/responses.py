@@ -0,0 +1,61 @@
+"""
+Response Helpers (responses.py)
+-------------------------------
+Fast-path JSON rendering for the EchoLogz API.
+
+Core Responsibilities:
+- Provide an orjson-backed JSONResponse (falls back to stdlib json if orjson
+  is not installed)
+- Pick the app-wide default response class based on settings.FAST_JSON
+- Let routers hand back already-shaped dicts without FastAPI re-running
+  response_model validation on them
+
+Why:
+FastAPI validates whatever a route returns against its response_model, then
+encodes it. When the route already produced the exact shape (ex: a column
+projection of UserOut fields straight from the DB), that second pass is
+pure overhead. Returning a Response object skips it.
+
+Typical Usage Example:
+    from backend.core.responses import fast_json_enabled, FastJSONResponse
+
+    if fast_json_enabled():
+        return FastJSONResponse(crud.list_users_projected(db))
+    return crud.list_users(db)
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+from backend.core.config import settings
+
+
+def render_json(content: Any) -> bytes:
+    """Encode plain JSON-ready data (dicts/lists/str/int) to bytes, orjson if available."""
+    if orjson is None:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is available."""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def fast_json_enabled() -> bool:
+    """True when the opt-in fast serialization path is switched on."""
+    return bool(settings.FAST_JSON)
+
+
+def default_response_class() -> type[JSONResponse]:
+    """Response class to hand to FastAPI(default_response_class=...)."""
+    return FastJSONResponse if fast_json_enabled() else JSONResponse
@@ -0,0 +1,193 @@
+"""
+Static Asset Server (static.py)
+-------------------------------
+Serves the backend's /static files from memory, precompressed and cacheable.
+
+Core Responsibilities:
+- Read every file under the static directory ONCE at startup
+- Precompress text assets (gzip always, brotli if the `brotli` package is installed)
+- Fingerprint filenames (style.css -> style.<hash>.css) for far-future
+  `Cache-Control: immutable`, and rewrite references to them inside .html files
+- Pick the smallest variant the client accepts (Accept-Encoding)
+- Answer If-None-Match with 304 using strong, per-variant ETags
+
+Why:
+Starlette's StaticFiles re-reads and re-sends the raw file on every request.
+Here each request is a dict lookup + header check; the API workers spend
+(almost) no CPU on static bytes.
+
+Caching policy:
+- Fingerprinted name (style.<hash>.css) -> public, max-age=1 year, immutable
+- Plain name (index.html, style.css)   -> no-cache (always revalidate, usually 304)
+
+Typical Usage Example (main.py):
+    from backend.core.static import PrecompressedStaticFiles
+
+    STATIC_DIR = Path(__file__).resolve().parent / "static"
+    app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
+"""
+
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import NamedTuple
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+MIN_COMPRESS_SIZE = 256  # bytes; smaller files are not worth a variant
+COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class _Asset(NamedTuple):
+    media_type: str
+    variants: dict[str, bytes]  # encoding ("identity" | "gzip" | "br") -> body
+    etags: dict[str, str]       # encoding -> strong ETag (quoted)
+    fingerprinted: str          # ex: "style.3f2a1b9c.css"
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+def _fingerprint(rel_path: str, digest: str) -> str:
+    p = Path(rel_path)
+    return str(p.with_name(f"{p.stem}.{digest[:10]}{p.suffix}"))
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Parse Accept-Encoding into the set of codings with q > 0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding)
+    return accepted
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# ------------------------------------------------------------------
+# ASGI app
+# ------------------------------------------------------------------
+class PrecompressedStaticFiles:
+    """Drop-in replacement for starlette's StaticFiles (GET/HEAD only)."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory).resolve()
+        self._routes: dict[str, tuple[_Asset, str]] = {}  # url path -> (asset, cache-control)
+        self._load()
+
+    # ---------- startup ----------
+    def _load(self):
+        raw: dict[str, bytes] = {}
+        for file in sorted(self.directory.rglob("*")):
+            if file.is_file():
+                raw[file.relative_to(self.directory).as_posix()] = file.read_bytes()
+
+        digests = {rel: hashlib.sha256(body).hexdigest() for rel, body in raw.items()}
+        renames = {rel: _fingerprint(rel, digests[rel]) for rel in raw if not rel.endswith(".html")}
+
+        for rel, body in raw.items():
+            if rel.endswith(".html"):
+                body = self._rewrite_refs(body, renames)
+            asset = self._build_asset(rel, body, renames.get(rel, rel))
+            self._routes[rel] = (asset, REVALIDATE)
+            if rel in renames:
+                self._routes[renames[rel]] = (asset, IMMUTABLE)
+
+    @staticmethod
+    def _rewrite_refs(html: bytes, renames: dict[str, str]) -> bytes:
+        """Point quoted references (href="style.css") at fingerprinted names."""
+        for old, new in renames.items():
+            for quote in (b'"', b"'"):
+                html = html.replace(quote + old.encode() + quote, quote + new.encode() + quote)
+        return html
+
+    @staticmethod
+    def _build_asset(rel: str, body: bytes, fingerprinted: str) -> _Asset:
+        media_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        digest = hashlib.sha256(body).hexdigest()[:16]
+
+        variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE_PREFIXES):
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    variants["br"] = br
+
+        etags = {enc: f'"{digest}-{enc}"' if enc != "identity" else f'"{digest}"' for enc in variants}
+        return _Asset(media_type, variants, etags, fingerprinted)
+
+    def fingerprinted(self, rel_path: str) -> str:
+        """Return the immutable-cacheable name for a static file (ex: for templates)."""
+        return self._routes[rel_path][0].fingerprinted
+
+    # ---------- request path ----------
+    @staticmethod
+    def _route_path(scope) -> str:
+        path, root = scope["path"], scope.get("root_path", "")
+        if root and path.startswith(root):  # newer Starlette keeps the mount prefix in path
+            path = path[len(root):]
+        return path.lstrip("/") or "index.html"
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            return await response(scope, receive, send)
+
+        entry = self._routes.get(self._route_path(scope))
+        if entry is None:
+            return await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+        asset, cache_control = entry
+
+        headers = Headers(scope=scope)
+        accepted = _accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), "identity")
+
+        out_headers = {
+            "ETag": asset.etags[encoding],
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            out_headers["Content-Encoding"] = encoding
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, asset.etags[encoding]):
+            return await Response(status_code=304, headers=out_headers)(scope, receive, send)
+
+        body = asset.variants[encoding]
+        if scope["method"] == "HEAD":
+            out_headers["Content-Length"] = str(len(body))
+            body = b""
+        response = Response(body, media_type=asset.media_type, headers=out_headers)
+        await response(scope, receive, send)
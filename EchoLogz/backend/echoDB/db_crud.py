@@ -19,9 +19,13 @@ Typical Usage Example (from another module):
     db_user = crud.get_user_by_id(db, user_id=1)
 """
 
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, insert, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from . import db_schemas, db_validation as val, db_session
-from .db_schemas import User
+from .db_schemas import User, TasteVector, UserMatch, Comparison
 from fastapi import HTTPException, status
 
 def create_user_with_hash(
@@ -46,12 +50,213 @@ def get_user_by_id(db: Session, user_id: int):
 def list_users(db: Session):
     return db.query(db_schemas.User).all()
 
+# ---------- Version stamps (conditional GET; no row load) ----------
+def get_user_stamp(db: Session, user_id: int):
+    """(version, updated_at) for one user, or None — an index lookup, no full row."""
+    return db.query(User.version, User.updated_at).filter(User.id == user_id).first()
+
+def get_user_stamp_by_username(db: Session, username: str):
+    """(id, version, updated_at) for one username, or None — GET /auth/me checks this before loading the row."""
+    return db.query(User.id, User.version, User.updated_at).filter(User.username == username).first()
+
+def get_users_stamp(db: Session):
+    """One aggregate row that changes whenever any user is added, updated or deleted."""
+    return db.query(
+        func.count(User.id), func.max(User.id),
+        func.coalesce(func.sum(User.version), 0), func.max(User.updated_at),
+    ).one()
+
+# ---------- Projections (fast path) ----------
+# ... Select only the columns UserOut exposes and return plain dicts, so the
+# ... router can serialize them directly (no ORM objects, no hashed_password).
+def _user_out_columns():
+    return [getattr(User, field) for field in val.UserOut.model_fields]
+
+def get_user_projected(db: Session, user_id: int) -> dict | None:
+    row = db.query(*_user_out_columns()).filter(User.id == user_id).first()
+    return row._asdict() if row else None
+
+def list_users_projected(db: Session) -> list[dict]:
+    return [row._asdict() for row in db.query(*_user_out_columns())]
+
+# ---------- Bulk import / export ----------
+def bulk_insert_users(db: Session, rows: list[dict]) -> list[tuple[int, str]]:
+    """
+    Insert many users in ONE transaction (executemany, no per-row refresh).
+    rows: [{"username", "email", "hashed_password"}, ...]
+    Returns [(row index, reason)] for rows skipped because of a unique conflict;
+    every other row is committed.
+    """
+    conflicts: dict[int, str] = {}
+    usernames = [r["username"] for r in rows]
+    emails = [r["email"] for r in rows if r["email"]]
+    existing = db.query(User.username, User.email).filter(
+        or_(User.username.in_(usernames), User.email.in_(emails))
+    ).all()
+    taken_names = {name for name, _ in existing}
+    taken_emails = {email for _, email in existing}
+
+    fresh: list[tuple[int, dict]] = []
+    for i, row in enumerate(rows):
+        if not row["email"]:  # NOT NULL: one such row would push the batch onto the slow path
+            conflicts[i] = "email is required"
+        elif row["username"] in taken_names:
+            conflicts[i] = "username already exists"
+        elif row["email"] in taken_emails:
+            conflicts[i] = "email already exists"
+        else:
+            taken_names.add(row["username"])   # also catches duplicates inside the batch
+            taken_emails.add(row["email"])
+            fresh.append((i, row))
+
+    if fresh:
+        try:
+            db.execute(insert(User), [row for _, row in fresh])
+            db.commit()
+        except IntegrityError:
+            # ... lost a race with another writer: redo this batch
+            # ... row by row under SAVEPOINTs so one bad row doesn't sink the rest
+            db.rollback()
+            for i, row in fresh:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(User), [row])
+                except IntegrityError as e:
+                    conflicts[i] = f"constraint violation: {e.orig}"
+            db.commit()
+    return sorted(conflicts.items())
+
+def iter_users_keyset(db: Session, batch_size: int = 1000):
+    """Yield UserOut-shaped dicts in id order, one keyset page (WHERE id > last) at a time."""
+    last_id = 0
+    while True:
+        page = (
+            db.query(*_user_out_columns())
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not page:
+            return
+        for row in page:
+            yield row._asdict()
+        last_id = page[-1].id
+
+# ---------- Taste vectors / materialized matches ----------
+def upsert_taste_vector(db: Session, user_id: int, dim: int, blob: bytes) -> None:
+    """blob = packed float32 (services.utils.vector_to_bytes)."""
+    db.merge(TasteVector(user_id=user_id, dim=dim, vector=blob, updated_at=datetime.now(timezone.utc)))
+    db.commit()
+
+def iter_taste_vectors(db: Session, batch_size: int = 10_000):
+    """Yield (user_id, dim, blob) in user_id order, one keyset page at a time."""
+    last_id = 0
+    while True:
+        page = (
+            db.query(TasteVector.user_id, TasteVector.dim, TasteVector.vector)
+            .filter(TasteVector.user_id > last_id)
+            .order_by(TasteVector.user_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not page:
+            return
+        yield from page
+        last_id = page[-1].user_id
+
+def count_taste_vectors(db: Session) -> int:
+    return db.query(func.count(TasteVector.user_id)).scalar()
+
+def taste_vector_user_ids(db: Session) -> set[int]:
+    """Every user_id with a taste vector (PK-only scan; used to find deletions)."""
+    return {user_id for (user_id,) in db.query(TasteVector.user_id)}
+
+def replace_user_matches(db: Session, rows, batch_size: int = 10_000) -> int:
+    """
+    Swap in a fresh set of user_matches in ONE transaction (readers never see
+    a half-written table). rows: iterable of {"user_id", "rank", "match_user_id", "score"}.
+    """
+    db.execute(delete(UserMatch))
+    total, chunk = 0, []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            db.execute(insert(UserMatch), chunk)
+            total, chunk = total + len(chunk), []
+    if chunk:
+        db.execute(insert(UserMatch), chunk)
+        total += len(chunk)
+    db.commit()
+    return total
+
+def get_user_matches(db: Session, user_id: int, limit: int | None = None) -> list[UserMatch]:
+    """Precomputed matches for one user, best first (rank 1..N)."""
+    query = db.query(UserMatch).filter(UserMatch.user_id == user_id).order_by(UserMatch.rank)
+    return query.limit(limit).all() if limit else query.all()
+
+# ---------- Comparisons ----------
+def record_comparison(db: Session, user_a_id: int, user_b_id: int, score: float) -> Comparison:
+    row = Comparison(user_a_id=user_a_id, user_b_id=user_b_id, score=score)
+    db.add(row)
+    db.commit()
+    return row
+
+# ---------- Incremental reads (jobs/snapshot.py) ----------
+# ... These yield whole PAGES (lists of rows) so the caller can turn each page
+# ... into one columnar batch.
+def iter_comparison_pages(db: Session, after_id: int = 0, batch_size: int = 50_000):
+    """Comparisons with id > after_id, in id order."""
+    while True:
+        page = (
+            db.query(Comparison.id, Comparison.user_a_id, Comparison.user_b_id,
+                     Comparison.score, Comparison.created_at)
+            .filter(Comparison.id > after_id)
+            .order_by(Comparison.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not page:
+            return
+        yield page
+        after_id = page[-1].id
+
+def get_comparisons_by_ids(db: Session, ids: list[int], batch_size: int = 1000):
+    """Comparisons whose id is in `ids` (ids that were missing from an earlier read), in id order."""
+    rows = []
+    for i in range(0, len(ids), batch_size):
+        rows.extend(
+            db.query(Comparison.id, Comparison.user_a_id, Comparison.user_b_id,
+                     Comparison.score, Comparison.created_at)
+            .filter(Comparison.id.in_(ids[i:i + batch_size]))
+            .all()
+        )
+    return sorted(rows, key=lambda row: row.id)
+
+def iter_taste_vector_pages(db: Session, after: tuple | None = None, batch_size: int = 50_000):
+    """Taste vectors changed after the (updated_at, user_id) watermark, in that order."""
+    while True:
+        query = db.query(TasteVector.user_id, TasteVector.dim, TasteVector.vector, TasteVector.updated_at)
+        if after is not None:
+            ts, uid = after
+            query = query.filter(
+                or_(TasteVector.updated_at > ts,
+                    (TasteVector.updated_at == ts) & (TasteVector.user_id > uid))
+            )
+        page = query.order_by(TasteVector.updated_at, TasteVector.user_id).limit(batch_size).all()
+        if not page:
+            return
+        yield page
+        after = (page[-1].updated_at, page[-1].user_id)
+
 def update_user(db: Session, user_id: int, payload: val.UserUpdate):
     user = db.query(db_schemas.User).filter(db_schemas.User.id == user_id).first()
     if not user:
         return None
-    for field, value in payload.dict(exclude_unset=True).items():
+    for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(user, field, value)
+    user.version += 1                              # new ETag for this representation
+    user.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(user)
     return user
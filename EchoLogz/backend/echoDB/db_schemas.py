@@ -28,7 +28,9 @@ WORK AROUND: Store Track IDs + URIs (this is ok)
 """
 
 
-from sqlalchemy import Column, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, Float, LargeBinary, ForeignKey, DateTime, func, inspect, text
 from .db_session import Base
 # from . import db_crud, db_session, schema
 
@@ -39,4 +41,78 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
\ No newline at end of file
+    hashed_password = Column(String, nullable=False)
+    # Bumped by db_crud.update_user -> drives ETag / Last-Modified (core/http_cache.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False,
+        default=lambda: datetime.now(timezone.utc), server_default=func.now(),
+    )
+
+
+# Per-user "taste vector": averaged Spotify audio features (see services/score.py).
+# Stored as packed float32 bytes — derived numbers only, no Spotify content.
+class TasteVector(Base):
+    __tablename__ = "taste_vectors"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    updated_at = Column(  # watermark for jobs/snapshot.py
+        DateTime(timezone=True), nullable=False, index=True,
+        default=lambda: datetime.now(timezone.utc), server_default=func.now(),
+    )
+
+
+# Materialized "Me vs Others" results, rebuilt by jobs/recommend.py.
+class UserMatch(Base):
+    __tablename__ = "user_matches"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 1 = best match
+    match_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+
+
+# One row per POST /match/compare (append-only; exported by jobs/snapshot.py).
+class Comparison(Base):
+    __tablename__ = "comparisons"
+    id = Column(Integer, primary_key=True, index=True)
+    user_a_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_b_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+# Columns added to tables that already existed (create_all never alters a table).
+# ... add_missing_columns() runs at startup (main.py lifespan) after create_all.
+def add_missing_columns(engine) -> list[str]:
+    """
+    Idempotent ALTER TABLE ... ADD COLUMN for every model column the live table
+    lacks, plus any index on it. Existing rows get the column's server_default;
+    func.now() becomes a constant timestamp (SQLite can't ADD COLUMN with a
+    non-constant default). Returns the "table.column" names added.
+    """
+    inspector = inspect(engine)
+    added = []
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue  # create_all just made it, complete
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT '{default}'" if isinstance(default, str) else f" DEFAULT '{now}'"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    return added
@@ -18,7 +18,9 @@ Files Connected:
 
 """
 
-from pydantic import BaseModel, EmailStr, ConfigDict
+import re
+
+from pydantic import BaseModel, EmailStr, ConfigDict, field_validator, model_validator
 
 # ---------- Inputs ----------
 class UserBase(BaseModel):
@@ -45,3 +47,35 @@ class UserUpdate(BaseModel):
     username: str | None = None
     password: str | None = None
     email: EmailStr | None = None
+
+# ---------- Bulk import (POST /users/bulk, one object per NDJSON line) ----------
+_BCRYPT_HASH = re.compile(r"\$2[aby]\$(0[4-9]|[12]\d|3[01])\$[./A-Za-z0-9]{53}")
+
+class UserImport(BaseModel):
+    username: str
+    email: EmailStr                      # users.email is NOT NULL
+    password: str | None = None
+    hashed_password: str | None = None   # migrations: keep an existing bcrypt hash as-is
+
+    @field_validator("hashed_password")
+    @classmethod
+    def _bcrypt_hash(cls, v: str | None):
+        # ... passlib raises on a malformed hash, which would make /auth/login 500 later
+        if v is not None and not _BCRYPT_HASH.fullmatch(v):
+            raise ValueError("hashed_password must be a bcrypt hash ($2b$<cost>$ + 53 chars)")
+        return v
+
+    @model_validator(mode="after")
+    def _needs_a_password(self):
+        if self.password is None and self.hashed_password is None:
+            raise ValueError("either password or hashed_password is required")
+        return self
+
+class BulkImportError(BaseModel):
+    line: int
+    username: str | None = None
+    error: str
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    failed: list[BulkImportError]
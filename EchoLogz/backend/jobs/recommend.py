@@ -0,0 +1,191 @@
+"""
+Recommendation Job (recommend.py)
+---------------------------------
+Precomputes every user's top-N "Me vs Others" matches offline and writes
+them to the user_matches table, so the dashboard reads a few rows instead
+of scoring on request.
+
+Pipeline:
+1. Load all taste vectors (keyset pages) into one float32 matrix, unit rows
+2. Copy it into multiprocessing SharedMemory ONCE — workers attach by name,
+   so vectors are never pickled per task
+3. Split the all-pairs similarity matrix into row blocks; each worker scores
+   its block against every user in column chunks (score.top_n_similar) and
+   keeps only the top-N per row with a partial sort (argpartition)
+4. Write all results back in one bulk, single-transaction swap
+
+Memory: the full N x N matrix never exists. Per task the temp is
+block_rows x col_chunk floats (512 x 65,536 x 4 B = 128 MB at the defaults).
+
+--quantize int8|float16 shares a compact copy instead (services/quantize.py):
+3-6x less shared memory. Both sides of each pair are quantized, so the score
+error is at most ~2x score_error_bound() (int8, dim=12: ~0.027).
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.jobs.recommend --top-n 20 --workers 8
+
+From a scheduler (cron wrapper, APScheduler, Celery beat, ...):
+            from backend.jobs.recommend import run
+            run(top_n=20)
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from backend.echoDB import db_crud as crud
+from backend.echoDB.db_session import SessionLocal
+from backend.services.quantize import MODES, QuantizedVectors
+from backend.services.score import top_n_similar, unit_rows
+from backend.services.utils import vector_from_bytes
+
+try:
+    from threadpoolctl import threadpool_limits  # ships with scikit-learn
+except ImportError:  # pragma: no cover
+    threadpool_limits = None
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOP_N = 20
+DEFAULT_BLOCK_ROWS = 512
+
+
+# ------------------------------------------------------------------
+# Worker side (runs in each pool process)
+# ------------------------------------------------------------------
+_worker = {}  # per-process: {"shm": SharedMemory, "matrix": np.ndarray | QuantizedVectors}
+
+def _attach(shm_name: str, shape: tuple[int, int], quantize: str | None = None):
+    """Pool initializer: map the parent's matrix (zero-copy) and pin BLAS to 1 thread."""
+    shm = SharedMemory(name=shm_name)  # the parent owns (and unlinks) the segment
+    _worker["shm"] = shm
+    if quantize:
+        _worker["matrix"] = QuantizedVectors.from_buffer(shm.buf, quantize, *shape)
+    else:
+        _worker["matrix"] = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+    if threadpool_limits is not None:
+        _worker["blas_limit"] = threadpool_limits(limits=1)  # N processes x 1 thread, not N x cores
+
+def _score_block(args):
+    r0, r1, top_n = args
+    matrix = _worker["matrix"]
+    idx, scores = top_n_similar(_block(matrix, r0, r1), matrix, top_n, row_offset=r0)
+    return r0, idx, scores
+
+def _block(matrix, r0: int, r1: int) -> np.ndarray:
+    if isinstance(matrix, QuantizedVectors):
+        return matrix.rows_f32(r0, r1)
+    return matrix[r0:r1]
+
+
+# ------------------------------------------------------------------
+# Pipeline steps
+# ------------------------------------------------------------------
+def load_vectors(db) -> tuple[np.ndarray, np.ndarray]:
+    """Return (user_ids int64[N], unit-row float32 matrix[N, dim])."""
+    ids, rows = [], []
+    for user_id, _dim, blob in crud.iter_taste_vectors(db):
+        ids.append(user_id)
+        rows.append(vector_from_bytes(blob))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+    return np.asarray(ids, dtype=np.int64), unit_rows(np.vstack(rows).astype(np.float32))
+
+def compute_top_n(
+    matrix: np.ndarray,
+    top_n: int = DEFAULT_TOP_N,
+    workers: int | None = None,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    quantize: str | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """All-pairs top-N over row blocks. Returns (row idx[N, top_n], scores[N, top_n])."""
+    n_users, dim = matrix.shape
+    workers = workers or os.cpu_count() or 1
+    out_idx = np.empty((n_users, top_n), dtype=np.int64)
+    out_scores = np.empty((n_users, top_n), dtype=np.float32)
+    blocks = [(r0, min(r0 + block_rows, n_users), top_n) for r0 in range(0, n_users, block_rows)]
+
+    if quantize:
+        matrix = QuantizedVectors.from_matrix(matrix, quantize)
+
+    if workers == 1:  # no pool / shared memory overhead for small runs
+        for r0, r1, _ in blocks:
+            out_idx[r0:r1], out_scores[r0:r1] = top_n_similar(
+                _block(matrix, r0, r1), matrix, top_n, row_offset=r0
+            )
+        return out_idx, out_scores
+
+    shm = SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    try:
+        if quantize:
+            matrix.write_to(shm.buf)
+        else:
+            np.ndarray(matrix.shape, dtype=np.float32, buffer=shm.buf)[:] = matrix
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_attach, initargs=(shm.name, (n_users, dim), quantize)
+        ) as pool:
+            for r0, idx, scores in pool.map(_score_block, blocks):
+                out_idx[r0:r0 + len(idx)], out_scores[r0:r0 + len(idx)] = idx, scores
+    finally:
+        shm.close()
+        shm.unlink()
+    return out_idx, out_scores
+
+def _match_rows(user_ids: np.ndarray, idx: np.ndarray, scores: np.ndarray):
+    for row in range(len(user_ids)):
+        user_id = int(user_ids[row])
+        for rank, (col, score) in enumerate(zip(idx[row], scores[row]), start=1):
+            if col < 0:  # fewer than top_n other users
+                break
+            yield {"user_id": user_id, "rank": rank,
+                   "match_user_id": int(user_ids[col]), "score": float(score)}
+
+def run(
+    top_n: int = DEFAULT_TOP_N,
+    workers: int | None = None,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    quantize: str | None = None,
+) -> dict:
+    """Scheduler entry point: load -> score -> write. Returns a small summary."""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        user_ids, matrix = load_vectors(db)
+        loaded = time.perf_counter()
+        if len(user_ids) == 0:
+            return {"users": 0, "rows_written": 0}
+        idx, scores = compute_top_n(matrix, top_n, workers, block_rows, quantize)
+        scored = time.perf_counter()
+        written = crud.replace_user_matches(db, _match_rows(user_ids, idx, scores))
+    finally:
+        db.close()
+    summary = {
+        "users": int(len(user_ids)),
+        "rows_written": written,
+        "load_s": round(loaded - started, 3),
+        "score_s": round(scored - loaded, 3),
+        "write_s": round(time.perf_counter() - scored, 3),
+    }
+    log.info("[EchoLogz] recommend job done: %s", summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize each user's top-N matches.")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS)
+    parser.add_argument("--quantize", choices=MODES, default=None, help="share a compact matrix")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(run(top_n=args.top_n, workers=args.workers, block_rows=args.block_rows,
+              quantize=args.quantize))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Analytics Snapshot Exporter (snapshot.py)
+-----------------------------------------
+Incrementally copies comparisons and taste vectors out of the OLTP database
+into date-partitioned Parquet files, so analysts can run ad-hoc aggregations
+(DuckDB, pandas, Spark, ...) without touching production tables.
+
+Layout (OUT_DIR):
+    comparisons/date=2025-03-05/part-<run>.parquet     <- created_at date
+    taste_vectors/date=2025-03-05/part-<run>.parquet   <- updated_at date
+    _watermark.json                                    <- where the last run stopped
+
+Incremental:
+- comparisons are append-only -> watermark = last exported id, plus the ids
+  skipped below it ("gaps")
+- taste vectors are upserted  -> watermark = (updated_at, user_id); a
+  re-ingested vector is exported again as a newer version
+- Rows are read in keyset pages and written as Parquet row groups, one open
+  writer per date partition: memory stays at ~one page.
+- Files are written as *.tmp and renamed; each table's watermark is saved
+  right after its files are, so a failed run only re-exports the table it
+  failed on.
+
+Late commits (OVERLAP):
+Ids and timestamps are assigned at INSERT, not COMMIT, so a slow transaction
+can commit a row that sorts BEHIND a watermark that was already saved.
+- comparisons: ids missing between exported ids are kept as gaps and looked
+  up again on later runs; a gap still missing after OVERLAP is treated as
+  a rolled-back insert and dropped
+- taste vectors: each run re-reads rows newer than (run start - OVERLAP) and
+  skips the (user_id, updated_at) versions it has already exported
+A row is only missed if its transaction stayed open longer than OVERLAP
+(+ replica lag, when reading from a replica).
+
+Keeping load off production:
+- Point --database-url at a read replica when one exists
+- Pages are small indexed range scans (WHERE id > ? / updated_at > ?), never
+  a full-table read inside one long transaction
+
+Requires pyarrow (pip install pyarrow).
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.jobs.snapshot --out analytics/
+            python -m backend.jobs.snapshot --out analytics/ --database-url postgresql+psycopg2://ro@replica/echologz
+"""
+
+import argparse
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.echoDB import db_crud as crud
+from backend.echoDB.db_session import SessionLocal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+log = logging.getLogger(__name__)
+
+PAGE_SIZE = 50_000
+WATERMARK_FILE = "_watermark.json"
+OVERLAP = timedelta(minutes=10)  # longest write transaction (+ replica lag) we tolerate
+MAX_GAP_SPAN = 10_000            # bigger id jumps (sequence reset / setval) aren't tracked as gaps
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+# ------------------------------------------------------------------
+# Watermark
+# ------------------------------------------------------------------
+def load_watermark(out_dir: Path) -> dict:
+    path = out_dir / WATERMARK_FILE
+    if not path.exists():  # first run: export everything
+        return {
+            "comparisons": {"id": 0, "gaps": []},
+            "taste_vectors": {"after": None, "cut": None, "seen": []},
+        }
+    return json.loads(path.read_text())
+
+def save_watermark(out_dir: Path, mark: dict) -> None:
+    tmp = out_dir / (WATERMARK_FILE + ".tmp")
+    tmp.write_text(json.dumps(mark, indent=2))
+    os.replace(tmp, out_dir / WATERMARK_FILE)
+
+
+# ------------------------------------------------------------------
+# Partitioned writer: one ParquetWriter per date=YYYY-MM-DD per run
+# ------------------------------------------------------------------
+class PartitionedWriter:
+    def __init__(self, root: Path, schema, run_id: str):
+        self.root = root
+        self.schema = schema
+        self.run_id = run_id
+        self._writers: dict[str, tuple] = {}  # date -> (ParquetWriter, tmp path, final path)
+        self.rows = 0
+
+    def write(self, dates: np.ndarray, table) -> None:
+        """Append `table`, split by the matching per-row date strings."""
+        for day in np.unique(dates):
+            part = table.filter(pa.array(dates == day))
+            self._writer(str(day)).write_table(part)
+        self.rows += table.num_rows
+
+    def _writer(self, day: str):
+        if day not in self._writers:
+            folder = self.root / f"date={day}"
+            folder.mkdir(parents=True, exist_ok=True)
+            final = folder / f"part-{self.run_id}.parquet"
+            tmp = final.with_suffix(".parquet.tmp")
+            self._writers[day] = (pq.ParquetWriter(tmp, self.schema, compression="zstd"), tmp, final)
+        return self._writers[day][0]
+
+    def close(self) -> None:
+        for writer, tmp, final in self._writers.values():
+            writer.close()
+            os.replace(tmp, final)
+
+    def abort(self) -> None:
+        for writer, tmp, _ in self._writers.values():
+            writer.close()
+            tmp.unlink(missing_ok=True)
+
+
+# ------------------------------------------------------------------
+# Tables
+# ------------------------------------------------------------------
+def _comparison_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("user_a_id", pa.int64()),
+        ("user_b_id", pa.int64()),
+        ("score", pa.float64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _vector_schema():
+    return pa.schema([
+        ("user_id", pa.int64()),
+        ("dim", pa.int32()),
+        ("vector", pa.list_(pa.float32())),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _write_comparisons(page, schema, writer) -> tuple:
+    ids, a, b, score, created = zip(*page)
+    created = [_utc(ts) for ts in created]
+    table = pa.table([ids, a, b, score, created], schema=schema)
+    writer.write(np.array([ts.date().isoformat() for ts in created]), table)
+    return ids
+
+def export_comparisons(db, out_dir: Path, mark: dict, run_id: str, started: datetime, overlap: timedelta):
+    """Returns (rows written, new {"id", "gaps"} watermark)."""
+    schema = _comparison_schema()
+    writer = PartitionedWriter(out_dir / "comparisons", schema, run_id)
+    last_id = mark["id"]
+    gaps = dict(mark["gaps"])  # missing id -> when a run first found it missing (iso)
+    try:
+        found = crud.get_comparisons_by_ids(db, sorted(gaps)) if gaps else []
+        if found:  # committed after an earlier run had read past them
+            for gap_id in _write_comparisons(found, schema, writer):
+                del gaps[gap_id]
+        for page in crud.iter_comparison_pages(db, last_id, PAGE_SIZE):
+            ids = _write_comparisons(page, schema, writer)
+            for prev, cur in zip((last_id,) + ids[:-1], ids):
+                if cur - prev > MAX_GAP_SPAN:
+                    log.warning("[EchoLogz] snapshot: not tracking id jump %d -> %d", prev, cur)
+                elif cur - prev > 1:
+                    gaps.update(dict.fromkeys(range(prev + 1, cur), started.isoformat()))
+            last_id = ids[-1]
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    expired = (started - overlap).isoformat()  # still missing -> rolled back, stop looking
+    return writer.rows, {"id": last_id, "gaps": [[g, seen] for g, seen in sorted(gaps.items()) if seen >= expired]}
+
+def export_taste_vectors(db, out_dir: Path, mark: dict, run_id: str, started: datetime, overlap: timedelta):
+    """Returns (rows written, new {"after", "cut", "seen"} watermark)."""
+    schema = _vector_schema()
+    writer = PartitionedWriter(out_dir / "taste_vectors", schema, run_id)
+    after = None if mark["after"] is None else (datetime.fromisoformat(mark["after"][0]), mark["after"][1])
+    seen = {tuple(key) for key in mark["seen"]}  # (user_id, updated_at iso) already exported, >= cut
+    start = after
+    if after is not None and mark["cut"] is not None:
+        cut = datetime.fromisoformat(mark["cut"])
+        if cut < _utc(after[0]):  # re-read the overlap window for late commits
+            start = (cut, 0)
+    cut = started - overlap
+    try:
+        for page in crud.iter_taste_vector_pages(db, start, PAGE_SIZE):
+            if after is None or (page[-1].updated_at, page[-1].user_id) > after:
+                after = (page[-1].updated_at, page[-1].user_id)  # as stored, so the next filter matches exactly
+            rows = [row for row in page if (row.user_id, row.updated_at.isoformat()) not in seen]
+            if not rows:
+                continue
+            user_ids, dims, blobs, updated = zip(*rows)
+            seen.update((uid, ts.isoformat()) for uid, ts in zip(user_ids, updated))
+            vectors = [np.frombuffer(blob, dtype=np.float32) for blob in blobs]
+            updated_utc = [_utc(ts) for ts in updated]
+            table = pa.table(
+                [user_ids, dims, pa.array(vectors, type=pa.list_(pa.float32())), updated_utc],
+                schema=schema,
+            )
+            writer.write(np.array([ts.date().isoformat() for ts in updated_utc]), table)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.rows, {
+        "after": None if after is None else [after[0].isoformat(), after[1]],
+        "cut": cut.isoformat(),
+        "seen": sorted([uid, ts] for uid, ts in seen if _utc(datetime.fromisoformat(ts)) >= cut),
+    }
+
+
+def run(out_dir: str | Path, database_url: str | None = None, overlap: timedelta = OVERLAP) -> dict:
+    """Export everything newer than the saved watermark. Returns a small summary."""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for snapshots: pip install pyarrow")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    mark = load_watermark(out_dir)
+    started = datetime.now(timezone.utc)
+    run_id = started.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+    if database_url:  # e.g. a read replica
+        engine = create_engine(database_url)
+        db = sessionmaker(bind=engine, autoflush=False)()
+    else:
+        engine, db = None, SessionLocal()
+    try:
+        # ... save after EACH table: a failure in the second must not re-export the first
+        n_cmp, mark["comparisons"] = export_comparisons(
+            db, out_dir, mark["comparisons"], run_id, started, overlap)
+        save_watermark(out_dir, mark)
+        n_vec, mark["taste_vectors"] = export_taste_vectors(
+            db, out_dir, mark["taste_vectors"], run_id, started, overlap)
+        save_watermark(out_dir, mark)
+    finally:
+        db.close()
+        if engine is not None:
+            engine.dispose()
+    summary = {
+        "run_id": run_id, "comparisons": n_cmp, "taste_vectors": n_vec,
+        "watermark": {"comparisons": mark["comparisons"]["id"], "taste_vectors": mark["taste_vectors"]["after"]},
+    }
+    log.info("[EchoLogz] snapshot done: %s", summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental Parquet snapshot for analytics.")
+    parser.add_argument("--out", required=True, help="snapshot root directory")
+    parser.add_argument("--database-url", default=None, help="read replica URL (default: app DB)")
+    parser.add_argument("--overlap-minutes", type=float, default=OVERLAP.total_seconds() / 60,
+                        help="longest write transaction (+ replica lag) to tolerate")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(run(args.out, args.database_url, timedelta(minutes=args.overlap_minutes)))
+
+
+if __name__ == "__main__":
+    main()
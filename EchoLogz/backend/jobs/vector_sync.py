@@ -0,0 +1,118 @@
+"""
+Vector Store Sync Job (vector_sync.py)
+--------------------------------------
+The single writer for the shared taste-vector store
+(services/vector_store.py). Copies the taste_vectors table (ingestion path)
+into the memory-mapped file that every API worker reads.
+
+- Incremental: only rows with updated_at past the last round's watermark
+  are read (keyset pages on the indexed column), and each page is applied as
+  one vectorized upsert_many(); rows whose vector didn't change aren't written
+- The watermark lives next to the store (sync_mark.json), with the time the
+  round started. The next round also re-reads rows newer than (that start -
+  OVERLAP), so a vector committed late with an older updated_at is still
+  picked up (re-applying an unchanged vector is a no-op)
+- Deletions: when the store holds more users than the table, the missing ids
+  are tombstoned (a PK-only scan, skipped when the counts agree)
+- One generation bump per page -> workers see the new rows on their next
+  request, with no reload or restart
+- A second concurrent writer is refused (flock on writer.lock)
+
+Run with Terminal Command (from EchoLogz/):
+            python -m backend.jobs.vector_sync
+            python -m backend.jobs.vector_sync --every 60     # keep syncing each minute
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from backend.echoDB import db_crud as crud
+from backend.echoDB.db_session import SessionLocal
+from backend.services.vector_store import VECTOR_STORE_DIR, VectorStoreWriter
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 10_000
+OVERLAP = timedelta(minutes=10)  # longest ingestion transaction we tolerate
+MARK_FILE = VECTOR_STORE_DIR / "sync_mark.json"
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+def _load_mark():
+    """((updated_at, user_id) of the newest row applied, when that round started), or (None, None)."""
+    if not MARK_FILE.exists():
+        return None, None
+    mark = json.loads(MARK_FILE.read_text())
+    return (datetime.fromisoformat(mark["after"][0]), mark["after"][1]), datetime.fromisoformat(mark["started"])
+
+def _save_mark(after, started: datetime) -> None:
+    tmp = MARK_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"after": [after[0].isoformat(), after[1]], "started": started.isoformat()}))
+    os.replace(tmp, MARK_FILE)
+
+
+def sync_once(writer: VectorStoreWriter | None = None) -> dict:
+    """Apply taste-vector changes since the last round. Returns a small summary."""
+    db = SessionLocal()
+    own_writer = writer is None
+    try:
+        if writer is None and (VECTOR_STORE_DIR / "meta.i64").exists():
+            writer = VectorStoreWriter(VECTOR_STORE_DIR)
+        started = datetime.now(timezone.utc)
+        mark, last_started = _load_mark()
+        start = mark
+        if mark is not None and last_started - OVERLAP < _utc(mark[0]):
+            start = (last_started - OVERLAP, 0)  # may have committed after last round read past it
+        read = written = deleted = 0
+        for page in crud.iter_taste_vector_pages(db, start, BATCH_SIZE):
+            user_ids, dims, blobs, updated = zip(*page)
+            if writer is None:
+                writer = VectorStoreWriter(VECTOR_STORE_DIR, dim=dims[0])
+            matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), writer.dim)
+            written += writer.upsert_many(user_ids, matrix)
+            read += len(page)
+            mark = max(mark, (updated[-1], user_ids[-1])) if mark else (updated[-1], user_ids[-1])
+        if writer is not None:
+            if len(writer) > crud.count_taste_vectors(db):  # some users were deleted
+                deleted = writer.delete_many(set(writer.user_ids()) - crud.taste_vector_user_ids(db))
+            writer.flush()
+            if mark is not None:
+                _save_mark(mark, started)  # after flush: a crash just re-applies the same rows
+        return {"read": read, "written": written, "deleted": deleted}
+    finally:
+        db.close()
+        if own_writer and writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync taste vectors into the shared mmap store.")
+    parser.add_argument("--every", type=float, default=0, help="repeat every N seconds (0 = once)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not args.every:
+        log.info("[EchoLogz] vector sync: %s", sync_once())
+        return
+    writer = None
+    try:
+        while True:
+            if writer is None and (VECTOR_STORE_DIR / "meta.i64").exists():
+                writer = VectorStoreWriter(VECTOR_STORE_DIR)  # hold the lock across rounds
+            log.info("[EchoLogz] vector sync: %s", sync_once(writer))
+            time.sleep(args.every)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,8 +21,7 @@ Access the running server at:
 
 """
 import sys, os
-
-from starlette.staticfiles import StaticFiles
+from pathlib import Path
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../.."))
 
@@ -34,6 +33,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.routers import r_auth, r_spot_auth, r_status, r_match
 from backend.echoDB import db_schemas, db_session
 from backend.core.config import settings # Load (.env) variables via config.py
+from backend.core.responses import default_response_class
+from backend.core.static import PrecompressedStaticFiles
+from backend.core.admission import AdmissionController, AdmissionControlMiddleware
 from backend.routers import r_users
 from contextlib import asynccontextmanager
 
@@ -62,11 +64,34 @@ app.add_middleware(
 async def lifespan(app: FastAPI):
     # Runs when the app starts
     db_schemas.Base.metadata.create_all(bind=db_session.engine)
+    db_schemas.add_missing_columns(db_session.engine)  # columns added since the tables were created
     yield
     # Runs when the app stops (if you need cleanup)
 
-app = FastAPI(title="EchoLogz API", lifespan=lifespan)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app = FastAPI(
+    title="EchoLogz API",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),  # orjson when settings.FAST_JSON
+)
+
+# ADMISSION CONTROL: cap heavy routes so they can't starve cheap reads (/users/{id}, /auth/me)
+# ... key = "tag:<router tag>" or "path:<route path>" -> (max concurrent, max queued)
+admission = AdmissionController(
+    limits={
+        "tag:match": (4, 16),          # CPU-heavy scoring
+        "path:/auth/login": (8, 32),   # bcrypt verify
+        "path:/auth/signup": (8, 32),  # bcrypt hash
+    },
+    rate_per_min=settings.RATE_LIMIT_PER_MIN,
+    burst=settings.RATE_LIMIT_BURST,
+    identify=r_auth.token_subject,  # rate-limit key = verified JWT sub, else client IP
+)
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission)
+
+# Static files: resolved relative to this file (not the cwd), read + precompressed once at startup
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
 
 # Routers
 app.include_router(r_auth.router)
@@ -79,4 +104,9 @@ app.include_router(r_match.router)
 @app.get("/")
 def read_root():
     return {"message": "EchoLogz backend is running!"}
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    """Queue depths, in-flight counts and rejections per bulkhead."""
+    return {"enabled": settings.ADMISSION_CONTROL, **admission.snapshot()}
     
\ No newline at end of file
@@ -12,11 +12,13 @@ Uses JWT for stateless auth. I/O models live in echoDB.db_validation.
 from backend.core.dependencies import get_db
 from backend.echoDB.db_validation import UserCreate, UserOut, TokenOut
 from backend.echoDB import db_crud
+from backend.echoDB.db_schemas import User
+from backend.core.http_cache import conditional_json, strong_etag
 
 from datetime import datetime, timedelta, timezone
 import os
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, \
     OAuth2PasswordRequestForm
 from jose import jwt, JWTError
@@ -60,25 +62,35 @@ def _decode_subject(token: str) -> str:
         raise JWTError("missing sub")
     return str(sub)
 
+def token_subject(token: str) -> str | None:
+    """Verified JWT subject, or None for a bad/expired token (admission-control caller key)."""
+    try:
+        return _decode_subject(token)
+    except JWTError:
+        return None
+
 # ------------------------------------------------------------------
 # Dependencies
 # ------------------------------------------------------------------
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> UserOut:
+def get_current_subject(token: str = Depends(oauth2_scheme)) -> str:
+    """Username from a valid bearer token (no DB access)."""
     try:
-        username = _decode_subject(token)
+        return _decode_subject(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def get_current_user(
+    username: str = Depends(get_current_subject),
+    db: Session = Depends(get_db),
+) -> User:
     user = db_crud.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserOut.model_validate(user)
+    return user  # ORM row; response_model validates it once on the way out
 
 # ------------------------------------------------------------------
 # Routes
@@ -94,7 +106,7 @@ def signup(payload: UserCreate, db: Session = Depends(get_db)):
         email=getattr(payload, "email", None),
         hashed_pw=hashed,
     )
-    return UserOut.model_validate(user)
+    return user
 
 @router.post("/login", response_model=TokenOut)
 def login(
@@ -108,5 +120,21 @@ def login(
     return TokenOut(access_token=token)
 
 @router.get("/me", response_model=UserOut)
-def me(current: UserOut = Depends(get_current_user)):
-    return current
\ No newline at end of file
+def me(
+    request: Request,
+    username: str = Depends(get_current_subject),
+    db: Session = Depends(get_db),
+):
+    # Same ETag as GET /users/{id}: both return the UserOut representation.
+    # ... Only the (id, version, updated_at) stamp is read up front; the row is
+    # ... loaded only when neither the client nor the render cache is current.
+    stamp = db_crud.get_user_stamp_by_username(db, username)
+    if not stamp:
+        raise HTTPException(status_code=404, detail="User not found")
+    return conditional_json(
+        request,
+        etag=strong_etag("user", stamp.id, stamp.version, stamp.updated_at),
+        last_modified=stamp.updated_at,
+        render=lambda: UserOut.model_validate(db_crud.get_user_projected(db, stamp.id)).model_dump(mode="json"),
+        cache_key=f"user-{stamp.id}",
+    )
\ No newline at end of file
@@ -36,12 +36,43 @@ Response Body:
     "score": 0.83,
     "pair_id": 58
 }
+
+GET /match/users/12/top?limit=3   ("Me vs Others")
+
+Response Body:
+{
+    "user_id": 12,
+    "source": "precomputed",
+    "matches": [{"rank": 1, "user_id": 37, "score": 0.91}, ...]
+}
+
+"precomputed" rows come from jobs/recommend.py (user_matches table). Users it
+hasn't reached yet (new since the last run) are scored live against the
+shared vector store instead ("live").
+
+POST /match/playlists   (header X-Spotify-Token: <user's Spotify access token>)
+
+Request Body:
+{
+    "playlist_a_id": "37i9dQZF1DXcBWIGoYBM5M",
+    "playlist_b_id": "37i9dQZF1DX0XUsuxWHRQd"
+}
+
+Response Body:
+{
+    "score": 0.97,
+    "playlist_a": {"playlist_id": "...", "snapshot_id": "...", "cached": false,
+                   "tracks": 50, "mean": {...}, "std": {...}},
+    "playlist_b": {...}
+}
 """
 
 from backend.core.dependencies import get_db
-from backend.services.score import compare_users
+from backend.echoDB import db_crud as crud
+from backend.services.score import compare_users, compare_playlists, top_matches
+from backend.services.spot_calls import SpotifyError
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
@@ -71,4 +102,85 @@ def post_compare(req: CompareReq, db: Session = Depends(get_db)):
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
-        )
\ No newline at end of file
+        )
+
+class MatchOut(BaseModel):
+    rank: int
+    user_id: int
+    score: float
+
+class TopMatchesResp(BaseModel):
+    user_id: int
+    source: str             # "precomputed" (user_matches table) or "live" (vector store scan)
+    matches: list[MatchOut]
+
+@router.get("/users/{user_id}/top", response_model=TopMatchesResp)
+def get_top_matches(
+    user_id: int,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    A user's best matches, read from the user_matches table (a few indexed rows).
+    Falls back to a live top-k over the vector store when the user has none yet.
+    """
+    if not crud.get_user_stamp(db, user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    rows = crud.get_user_matches(db, user_id, limit)
+    if rows:
+        return TopMatchesResp(
+            user_id=user_id, source="precomputed",
+            matches=[MatchOut(rank=r.rank, user_id=r.match_user_id, score=r.score) for r in rows],
+        )
+    try:
+        live = top_matches(user_id, limit)
+    except ValueError:  # no taste vector for this user (yet)
+        live = []
+    return TopMatchesResp(
+        user_id=user_id, source="live",
+        matches=[MatchOut(rank=rank, **m) for rank, m in enumerate(live, start=1)],
+    )
+
+# Spotify reply status -> our status. The user's token is bad or lacks scope (401/403),
+# the playlist doesn't exist (404), or the caller is rate limited (429); anything
+# else (no reply, 5xx, unexpected 4xx / body) is Spotify failing us -> 502.
+_SPOTIFY_STATUS = {
+    401: status.HTTP_401_UNAUTHORIZED,
+    403: status.HTTP_401_UNAUTHORIZED,
+    404: status.HTTP_404_NOT_FOUND,
+    429: status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+def _spotify_http_error(e: SpotifyError) -> HTTPException:
+    code = _SPOTIFY_STATUS.get(e.status_code, status.HTTP_502_BAD_GATEWAY)
+    headers = {"Retry-After": e.retry_after} if code == 429 and e.retry_after else None
+    return HTTPException(status_code=code, detail=str(e), headers=headers)
+
+class PlaylistCompareReq(BaseModel):
+    playlist_a_id: str = Field(min_length=1)
+    playlist_b_id: str = Field(min_length=1)
+
+class PlaylistProfile(BaseModel):
+    playlist_id: str
+    snapshot_id: str
+    cached: bool            # True = unchanged since last time, no tracks re-fetched
+    tracks: int
+    mean: dict[str, float]
+    std: dict[str, float]
+
+class PlaylistCompareResp(BaseModel):
+    score: float
+    playlist_a: PlaylistProfile
+    playlist_b: PlaylistProfile
+
+@router.post("/playlists", response_model=PlaylistCompareResp)
+def post_compare_playlists(
+    req: PlaylistCompareReq,
+    spotify_token: str = Header(alias="X-Spotify-Token"),
+):
+    try:
+        return compare_playlists(spotify_token, req.playlist_a_id, req.playlist_b_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SpotifyError as e:
+        raise _spotify_http_error(e)
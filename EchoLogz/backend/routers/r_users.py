@@ -27,32 +27,153 @@ Outcome:
 from backend.core.dependencies import get_db
 from backend.echoDB import db_crud as crud
 from backend.echoDB import db_validation as val
+from backend.echoDB.db_session import SessionLocal
+from backend.core.responses import fast_json_enabled
+from backend.core.http_cache import conditional_json, strong_etag
+from backend.routers.r_auth import pwd_context
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 # EXAMPLE:
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# ------------------------------------------------------------------
+# Bulk import / export helpers
+# ------------------------------------------------------------------
+BULK_BATCH_SIZE = 1000   # rows per INSERT transaction
+EXPORT_PAGE_SIZE = 1000  # rows per keyset page
+
+# bcrypt releases the GIL, so a thread pool hashes on every core
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="bulk-hash")
+
+async def _ndjson_lines(request: Request):
+    """Yield (line number, raw line) from a streamed NDJSON body without buffering it all."""
+    buf, line_no = b"", 0
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buf.strip():
+        yield line_no + 1, buf
+
+def _import_batch(db: Session, lines: list[tuple[int, bytes]]):
+    """Validate + hash (in parallel) + insert one batch of raw NDJSON lines.
+    Runs in the threadpool: validation (EmailStr) costs ~150 us/line, too much for the event loop.
+    Returns (inserted count, [BulkImportError])."""
+    batch, failed = [], []
+    for line_no, line in lines:
+        try:
+            batch.append((line_no, val.UserImport.model_validate_json(line)))
+        except ValidationError as e:
+            failed.append(val.BulkImportError(line=line_no, error=e.errors()[0]["msg"]))
+    if not batch:
+        return 0, failed
+    plain = [u.password for _, u in batch if u.hashed_password is None]
+    hashes = iter(list(_hash_pool.map(pwd_context.hash, plain)))
+    rows = [
+        {
+            "username": u.username,
+            "email": u.email,
+            "hashed_password": u.hashed_password or next(hashes),
+        }
+        for _, u in batch
+    ]
+    conflicts = crud.bulk_insert_users(db, rows)
+    failed.extend(
+        val.BulkImportError(line=batch[i][0], username=rows[i]["username"], error=reason)
+        for i, reason in conflicts
+    )
+    return len(rows) - len(conflicts), failed
+
+def _render_user(row: dict) -> dict:
+    """UserOut JSON for a projected row; validated unless FAST_JSON trusts the DB shape.
+    Only runs on a render-cache miss (once per user version per worker)."""
+    if fast_json_enabled():
+        return row
+    return val.UserOut.model_validate(row).model_dump(mode="json")
+
+def _export_lines():
+    # ... own session: the response streams after the request's get_db() may be closed
+    db = SessionLocal()
+    try:
+        for user in crud.iter_users_keyset(db, batch_size=EXPORT_PAGE_SIZE):
+            yield json.dumps(user) + "\n"
+    finally:
+        db.close()
+
+# ------------------------------------------------------------------
+# Routes
+# ------------------------------------------------------------------
+
 @router.post("/", response_model=val.UserOut,
              status_code=status.HTTP_201_CREATED)
 def create_user_endpoint(payload: val.UserCreate, db: Session = Depends(get_db)):
     """Create a new user and return the created record."""
     return crud.create_user(db, payload)
 
+@router.post("/bulk", response_model=val.BulkImportResult)
+async def bulk_import_endpoint(request: Request, db: Session = Depends(get_db)):
+    """
+    Import users from an NDJSON body (Content-Type: application/x-ndjson),
+    one UserImport object per line. Rows are inserted in batches of
+    BULK_BATCH_SIZE; invalid or conflicting rows are reported, not fatal.
+    """
+    inserted, failed, batch = 0, [], []
+    async for line_no, line in _ndjson_lines(request):
+        batch.append((line_no, line))  # validated in the threadpool, not on the event loop
+        if len(batch) >= BULK_BATCH_SIZE:
+            n, errs = await run_in_threadpool(_import_batch, db, batch)
+            inserted, batch = inserted + n, []
+            failed.extend(errs)
+    if batch:
+        n, errs = await run_in_threadpool(_import_batch, db, batch)
+        inserted += n
+        failed.extend(errs)
+    failed.sort(key=lambda e: e.line)
+    return val.BulkImportResult(inserted=inserted, failed=failed)
+
+@router.get("/export")
+def export_users_endpoint():
+    """Stream every user as NDJSON (UserOut fields), paging by id."""
+    return StreamingResponse(_export_lines(), media_type="application/x-ndjson")
+
 @router.get("/{user_id}", response_model=val.UserOut)
-def get_user_endpoint(user_id: int, db: Session = Depends(get_db)):
-    """Return a single user by id, or 404 if not found."""
-    user = crud.get_user_by_id(db, user_id)
-    if not user:
+def get_user_endpoint(user_id: int, request: Request, db: Session = Depends(get_db)):
+    """Return a single user by id, or 404 if not found. Supports ETag / 304."""
+    stamp = crud.get_user_stamp(db, user_id)
+    if not stamp:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+    return conditional_json(
+        request,
+        etag=strong_etag("user", user_id, stamp.version, stamp.updated_at),
+        last_modified=stamp.updated_at,
+        render=lambda: _render_user(crud.get_user_projected(db, user_id)),
+        cache_key=f"user-{user_id}",
+    )
 
 @router.get("/", response_model=list[val.UserOut])
-def list_users_endpoint(db: Session = Depends(get_db)):
-    return crud.list_users(db)
+def list_users_endpoint(request: Request, db: Session = Depends(get_db)):
+    count, max_id, version_sum, last_modified = crud.get_users_stamp(db)
+    return conditional_json(
+        request,
+        etag=strong_etag("users", count, max_id, version_sum, last_modified),
+        last_modified=None,  # max(updated_at) doesn't move on a delete: ETag only
+        render=lambda: [_render_user(row) for row in crud.list_users_projected(db)],
+        cache_key="users",
+    )
 
 @router.put("/{user_id}", response_model=val.UserOut)
 def update_user_endpoint(
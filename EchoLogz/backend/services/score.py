@@ -23,12 +23,250 @@ Typical Usage Example:
 import numpy as np                   # For vector math and similarity calculations
 from typing import List, Dict        # For clean function type hints
 from sklearn.metrics.pairwise import cosine_similarity  # Optional: built-in cosine sim
-from echoDB import db_crud as crud, db_schemas as models          # To fetch data from the database if needed
+from backend.echoDB import db_crud as crud, db_schemas as models  # To fetch data from the database if needed
+from backend.services.vector_store import VECTOR_STORE_DIR, TOMBSTONE, VectorStoreReader  # Shared mmap'd taste vectors
+from backend.services.quantize import QuantizedVectors  # Optional compact (float16 / int8) matrices
+from backend.services import spot_calls                 # Streamed playlist pages + audio features
+from collections import OrderedDict
+from threading import Lock
 
 def _score():
     #some logic
     return #score
 
-def compare_users():
-    return
 
+# ------------------------------------------------------------------
+# Batch / top-N scoring (used by jobs/recommend.py)
+# ------------------------------------------------------------------
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row IN PLACE (float32) so dot product == cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _keep_top_n(scores: np.ndarray, idx: np.ndarray, n: int):
+    """Per row, keep the n largest scores (unordered) — O(width) partial sort."""
+    if scores.shape[1] <= n:
+        return scores, idx
+    part = np.argpartition(scores, -n, axis=1)[:, -n:]
+    return np.take_along_axis(scores, part, axis=1), np.take_along_axis(idx, part, axis=1)
+
+
+def _rows_f32(matrix, start: int, stop: int) -> np.ndarray:
+    """Rows [start, stop) as float32, whether `matrix` is an ndarray or QuantizedVectors."""
+    if isinstance(matrix, QuantizedVectors):
+        return matrix.rows_f32(start, stop)
+    return matrix[start:stop]
+
+
+def top_n_similar(
+    block: np.ndarray,
+    matrix,
+    n: int,
+    row_offset: int,
+    col_chunk: int = 65_536,
+):
+    """
+    Top-n cosine matches for each row of `block` against every row of `matrix`.
+
+    block      = matrix[row_offset : row_offset + len(block)] (unit rows, float32)
+    matrix     = float32 ndarray, or QuantizedVectors (scored chunk by chunk, see quantize.py)
+    col_chunk  = columns scored per matmul; bounds temp memory to len(block) x col_chunk
+
+    Returns (idx, scores), both shape (len(block), n), best first. Self-matches
+    are excluded; if there are fewer than n others, the tail is idx -1 / -inf.
+    """
+    b = block.shape[0]
+    rows = np.arange(b)
+    best_s = np.full((b, n), -np.inf, dtype=np.float32)
+    best_i = np.full((b, n), -1, dtype=np.int64)
+
+    for c0 in range(0, len(matrix), col_chunk):
+        sims = block @ _rows_f32(matrix, c0, c0 + col_chunk).T   # (b, chunk) in one BLAS call
+        self_cols = rows + row_offset - c0
+        mine = (self_cols >= 0) & (self_cols < sims.shape[1])
+        sims[rows[mine], self_cols[mine]] = -np.inf          # never match yourself
+        cols = np.broadcast_to(np.arange(c0, c0 + sims.shape[1]), sims.shape)
+        chunk_s, chunk_i = _keep_top_n(sims, cols, n)
+        best_s, best_i = _keep_top_n(
+            np.concatenate([best_s, chunk_s], axis=1),
+            np.concatenate([best_i, chunk_i], axis=1),
+            n,
+        )
+
+    order = np.argsort(-best_s, axis=1)                      # only n wide: cheap full sort
+    best_s = np.take_along_axis(best_s, order, axis=1)
+    best_i = np.take_along_axis(best_i, order, axis=1)
+    best_i[np.isneginf(best_s)] = -1
+    return best_i, best_s
+
+# ------------------------------------------------------------------
+# On-request scoring (runs straight against the memory-mapped store)
+# ------------------------------------------------------------------
+_store: VectorStoreReader | None = None  # one read-only mapping per worker process
+
+def get_vector_store() -> VectorStoreReader:
+    global _store
+    if _store is None:
+        try:
+            _store = VectorStoreReader(VECTOR_STORE_DIR)
+        except FileNotFoundError:
+            raise ValueError("No taste vectors have been ingested yet")
+    return _store
+
+def compare_users(db, user_a_id: int, user_b_id: int, sample: int | None = None) -> Dict:
+    """Cosine similarity of two users' taste vectors (rows are stored unit-length)."""
+    store = get_vector_store()
+    a, b = store.get(user_a_id), store.get(user_b_id)
+    missing = [uid for uid, vec in ((user_a_id, a), (user_b_id, b)) if vec is None]
+    if missing:
+        raise ValueError(f"No taste vector for user(s): {missing}")
+    # ... the store lags deletes until the next vector_sync round; the DB is the source of truth
+    gone = [uid for uid in (user_a_id, user_b_id) if crud.get_user_stamp(db, uid) is None]
+    if gone:
+        raise ValueError(f"No such user(s): {gone}")
+    score = float(np.dot(a, b))
+    pair = crud.record_comparison(db, user_a_id, user_b_id, score)  # feeds history + analytics
+    return {"score": score, "pair_id": pair.id}
+
+RERANK_FACTOR = 4  # int8 shortlist size = k * RERANK_FACTOR, re-scored in float32
+
+def top_matches(user_id: int, k: int = 10) -> List[Dict]:
+    """
+    Live top-k for one user, straight from the mapped store (no copies).
+
+    Scans the int8 copy (3x fewer bytes than float32, fused top-K in quantize.py),
+    then re-scores a k * RERANK_FACTOR shortlist from the float32 rows, so the
+    returned scores are exact. A true top-k match can only be missed if it
+    trails the shortlist's last entry by more than 2 * score_error_bound("int8", dim).
+    """
+    store = get_vector_store()
+    vec = store.get(user_id)
+    if vec is None:
+        raise ValueError(f"No taste vector for user: {user_id}")
+    row = store.row_of(user_id)
+    qv = store.quantized()
+    if qv is None:  # store predates the int8 copy: plain float32 scan
+        idx, scores = top_n_similar(vec[None, :], store.matrix(), k, row_offset=row)
+        idx, scores = idx[0], scores[0]
+    else:
+        shortlist, _ = qv.top_k(vec, k * RERANK_FACTOR, exclude_row=row)
+        exact = store.matrix()[shortlist] @ vec
+        order = np.argsort(-exact)[:k]
+        idx, scores = shortlist[order], exact[order]
+    ids = store.user_ids()
+    return [
+        {"user_id": int(ids[i]), "score": float(s)}
+        for i, s in zip(idx, scores) if i >= 0 and ids[i] != TOMBSTONE
+    ]
+
+
+# ------------------------------------------------------------------
+# Playlist vs Playlist (streamed; constant memory per playlist)
+# ------------------------------------------------------------------
+# Audio features used for playlist taste, each mapped onto ~[0, 1]
+FEATURE_KEYS = [
+    "danceability", "energy", "speechiness", "acousticness",
+    "instrumentalness", "liveness", "valence", "tempo", "loudness",
+]
+_FEATURE_SCALE = {"tempo": lambda v: v / 250.0, "loudness": lambda v: (v + 60.0) / 60.0}
+
+PLAYLIST_CACHE_SIZE = 1024
+
+
+class RunningStats:
+    """
+    Online per-feature mean / variance (Welford, merged a batch at a time with
+    Chan et al.'s parallel update). Memory is O(features), not O(tracks).
+    """
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, dim: int):
+        self.n = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros(dim)
+
+    def update(self, batch: np.ndarray) -> None:
+        """Fold a (rows, dim) batch into the running stats."""
+        k = batch.shape[0]
+        if k == 0:
+            return
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        delta = batch_mean - self.mean
+        total = self.n + k
+        self.mean += delta * (k / total)
+        self.m2 += batch_m2 + delta ** 2 * (self.n * k / total)
+        self.n = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        return self.m2 / self.n if self.n else np.zeros_like(self.m2)
+
+    def summary(self) -> Dict:
+        return {
+            "tracks": self.n,
+            "mean": dict(zip(FEATURE_KEYS, self.mean.round(4).tolist())),
+            "std": dict(zip(FEATURE_KEYS, np.sqrt(self.variance).round(4).tolist())),
+        }
+
+
+def _feature_rows(features: List[Dict]) -> np.ndarray:
+    rows = np.array([[f[key] for key in FEATURE_KEYS] for f in features], dtype=np.float64)
+    for j, key in enumerate(FEATURE_KEYS):
+        if key in _FEATURE_SCALE and len(rows):
+            rows[:, j] = _FEATURE_SCALE[key](rows[:, j])
+    return rows.reshape(-1, len(FEATURE_KEYS))
+
+
+# (playlist_id, snapshot_id) -> RunningStats; a changed playlist gets a new snapshot_id
+_playlist_cache: "OrderedDict[tuple[str, str], RunningStats]" = OrderedDict()
+_playlist_cache_lock = Lock()
+
+
+def playlist_stats(access_token: str, playlist_id: str) -> tuple[RunningStats, str, bool]:
+    """(stats, snapshot_id, cache hit). Streams track pages -> feature batches -> stats."""
+    snapshot_id = spot_calls.get_playlist_snapshot_id(access_token, playlist_id)
+    key = (playlist_id, snapshot_id)
+    with _playlist_cache_lock:
+        if key in _playlist_cache:
+            _playlist_cache.move_to_end(key)
+            return _playlist_cache[key], snapshot_id, True
+
+    stats = RunningStats(len(FEATURE_KEYS))
+    for track_ids in spot_calls.iter_playlist_track_ids(access_token, playlist_id):
+        for features in spot_calls.iter_audio_features(access_token, track_ids):
+            stats.update(_feature_rows(features))
+
+    with _playlist_cache_lock:
+        _playlist_cache[key] = stats
+        while len(_playlist_cache) > PLAYLIST_CACHE_SIZE:
+            _playlist_cache.popitem(last=False)
+    return stats, snapshot_id, False
+
+
+def compare_playlists(access_token: str, playlist_a_id: str, playlist_b_id: str) -> Dict:
+    """Cosine similarity of the two playlists' mean feature vectors, plus their profiles."""
+    results = {}
+    for label, playlist_id in (("a", playlist_a_id), ("b", playlist_b_id)):
+        stats, snapshot_id, cached = playlist_stats(access_token, playlist_id)
+        if stats.n == 0:
+            raise ValueError(f"Playlist {playlist_id} has no tracks with audio features")
+        results[label] = (playlist_id, snapshot_id, cached, stats)
+
+    mean_a, mean_b = results["a"][3].mean, results["b"][3].mean
+    cosine = np.dot(mean_a, mean_b) / (np.linalg.norm(mean_a) * np.linalg.norm(mean_b) or 1.0)
+    score = float(np.clip(cosine, -1.0, 1.0))
+    return {
+        "score": score,
+        **{
+            f"playlist_{label}": {
+                "playlist_id": playlist_id, "snapshot_id": snapshot_id, "cached": cached,
+                **stats.summary(),
+            }
+            for label, (playlist_id, snapshot_id, cached, stats) in results.items()
+        },
+    }
@@ -18,6 +18,8 @@ Example routes that may call these functions:
 - /users/me            -> get_user_profile()
 - /playlists           -> get_user_playlists()
 - /playlists/{id}/tracks -> get_playlist_tracks()
+- /match/playlists     -> get_playlist_snapshot_id(), iter_playlist_track_ids(),
+                          iter_audio_features()  (streamed, one page at a time)
 
 Security notes:
 - Requires a valid access_token from spotify_auth.py
@@ -28,6 +30,34 @@ Security notes:
 import requests
 
 BASE_URL = "https://api.spotify.com/v1"
+PAGE_LIMIT = 100           # max items per /playlists/{id}/tracks page
+FEATURES_BATCH = 100       # max ids per /audio-features call
+
+_session = requests.Session()  # keep-alive across the many paged calls
+
+
+class SpotifyError(RuntimeError):
+    """Spotify Web API unreachable, or a non-200 / unreadable reply (status_code None = no reply).
+    retry_after = the reply's Retry-After header (seconds, as sent), set on 429s."""
+
+    def __init__(self, status_code: int | None, detail, retry_after: str | None = None):
+        super().__init__(f"Spotify API {status_code or 'unreachable'}: {detail}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _get(access_token: str, url: str, params: dict | None = None) -> dict:
+    headers = {"Authorization": f"Bearer {access_token}"}
+    try:
+        response = _session.get(url, headers=headers, params=params, timeout=10)
+    except requests.RequestException as e:  # timeout, DNS, connection reset, ...
+        raise SpotifyError(None, e) from e
+    if response.status_code != 200:
+        raise SpotifyError(response.status_code, response.text[:200], response.headers.get("Retry-After"))
+    try:
+        return response.json()
+    except ValueError as e:  # JSONDecodeError is a ValueError: must not look like a bad request
+        raise SpotifyError(response.status_code, f"invalid JSON: {response.text[:200]}") from e
 
 def get_user_profile(access_token: str):
     headers = {"Authorization": f"Bearer {access_token}"}
@@ -35,4 +65,33 @@ def get_user_profile(access_token: str):
     if response.status_code == 200:
         return response.json()
     else:
-        return {"error": response.json()}
\ No newline at end of file
+        return {"error": response.json()}
+
+
+def get_playlist_snapshot_id(access_token: str, playlist_id: str) -> str:
+    """Current snapshot_id (changes whenever the playlist's tracks change)."""
+    reply = _get(access_token, f"{BASE_URL}/playlists/{playlist_id}", {"fields": "snapshot_id"})
+    if "snapshot_id" not in reply:
+        raise SpotifyError(200, "reply has no snapshot_id")
+    return reply["snapshot_id"]
+
+
+def iter_playlist_track_ids(access_token: str, playlist_id: str):
+    """Yield one page (list) of track ids at a time; local/unavailable tracks are skipped."""
+    url = f"{BASE_URL}/playlists/{playlist_id}/tracks"
+    params = {"fields": "items(track(id)),next", "limit": PAGE_LIMIT}
+    while url:
+        page = _get(access_token, url, params)
+        ids = [item["track"]["id"] for item in page.get("items", [])
+               if item.get("track") and item["track"].get("id")]
+        if ids:
+            yield ids
+        url, params = page.get("next"), None  # `next` already carries the query string
+
+
+def iter_audio_features(access_token: str, track_ids: list[str]):
+    """Yield lists of audio-feature dicts, FEATURES_BATCH ids per request (nulls dropped)."""
+    for i in range(0, len(track_ids), FEATURES_BATCH):
+        batch = ",".join(track_ids[i:i + FEATURES_BATCH])
+        features = _get(access_token, f"{BASE_URL}/audio-features", {"ids": batch}).get("audio_features", [])
+        yield [f for f in features if f]
@@ -36,10 +36,22 @@ from sklearn.preprocessing import normalize  # Optional: for feature normalizati
 
 
 def normalize_vector(vector):
-    """Normalize a numeric list or NumPy array to unit length."""
-    vector = np.array(vector)
+    """Unit-length float64 copy of a numeric list or NumPy array (a zero vector stays zero)."""
+    vector = np.array(vector, dtype=np.float64)  # always one new array; the input is never modified
     norm = np.linalg.norm(vector)
-    return vector / norm if norm != 0 else vector
+    if norm != 0:
+        vector /= norm                             # in place on that copy: no second allocation
+    return vector
+
+
+def vector_to_bytes(vector) -> bytes:
+    """Pack a vector as float32 bytes (TasteVector.vector column)."""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def vector_from_bytes(blob: bytes) -> np.ndarray:
+    """Unpack TasteVector.vector bytes into a read-only float32 array (no copy)."""
+    return np.frombuffer(blob, dtype=np.float32)
 
 
 def timestamp_now():
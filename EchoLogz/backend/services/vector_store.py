@@ -0,0 +1,310 @@
+"""
+Shared Taste-Vector Store (vector_store.py)
+-------------------------------------------
+An on-disk, append-friendly matrix of user taste vectors that every uvicorn
+worker maps read-only with np.memmap — one copy in the OS page cache,
+shared by all processes, instead of one copy per worker.
+
+Files (in VECTOR_STORE_DIR):
+- vectors.f32  float32[capacity, dim]  unit-length rows (dot product == cosine)
+- ids.i64      int64[capacity]         user_id stored in each row
+- codes.i8     int8[capacity, dim]     int8 copy of each row (services/quantize.py)
+- scales.f32   float32[capacity]       its per-row scale: row ~= scale * codes
+- meta.i64     int64[4]                generation, rows, dim, capacity
+- writer.lock  flock() held by the single writer process
+
+Rules:
+- ONE writer (VectorStoreWriter) applies updates from the ingestion path.
+  New users append a row; existing users are overwritten in place.
+- Data is written BEFORE `rows` is raised, and `generation` is bumped last,
+  so readers never index a half-written row.
+- Readers (VectorStoreReader) compare `generation` on each access (one int
+  read); if it moved, they index only the new rows (and remap if the file grew).
+- Deleting a user tombstones its row (id -> TOMBSTONE, vector zeroed); the
+  id is cleared first, so a reader never returns a deleted user's vector.
+  Tombstoned rows are not reused: re-adding the user appends a new row.
+- Top-K scans read the int8 copy (16 B/user at dim=12 instead of 48), then
+  re-score the shortlist from vectors.f32 (score.top_matches).
+
+Typical Usage Example:
+    from services.vector_store import VectorStoreReader, VectorStoreWriter
+
+    with VectorStoreWriter(VECTOR_STORE_DIR, dim=12) as w:   # ingestion side
+        w.upsert(42, features)
+        w.upsert_many(user_ids, matrix)                      # one vectorized batch
+        w.delete_many([7])
+
+    store = VectorStoreReader(VECTOR_STORE_DIR)              # API workers
+    vec = store.get(42)                                      # zero-copy view
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from backend.services.quantize import QuantizedVectors
+
+try:
+    import fcntl  # POSIX only; single-writer guard
+except ImportError:  # pragma: no cover - Windows dev boxes
+    fcntl = None
+
+VECTOR_STORE_DIR = Path(
+    os.getenv("VECTOR_STORE_DIR", Path(__file__).resolve().parent.parent / "data" / "vectors")
+)
+
+GEN, ROWS, DIM, CAP = range(4)  # meta.i64 slots
+TOMBSTONE = 0                   # ids.i64 value of a deleted row (user ids start at 1)
+INITIAL_CAPACITY = 1024
+
+
+def _paths(directory: Path) -> dict[str, Path]:
+    return {
+        "vectors": directory / "vectors.f32",
+        "ids": directory / "ids.i64",
+        "codes": directory / "codes.i8",
+        "scales": directory / "scales.f32",
+        "meta": directory / "meta.i64",
+        "lock": directory / "writer.lock",
+    }
+
+
+# ------------------------------------------------------------------
+# Writer (exactly one process)
+# ------------------------------------------------------------------
+class VectorStoreWriter:
+    def __init__(self, directory: str | Path = VECTOR_STORE_DIR, dim: int | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._paths = _paths(self.directory)
+
+        self._lock = open(self._paths["lock"], "w")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock.close()
+                raise RuntimeError(f"another process is already writing {self.directory}")
+
+        if self._paths["meta"].exists():
+            self._meta = np.memmap(self._paths["meta"], dtype=np.int64, mode="r+", shape=(4,))
+            if dim is not None and dim != self._meta[DIM]:
+                raise ValueError(f"store has dim {self._meta[DIM]}, got {dim}")
+        else:
+            if dim is None:
+                raise ValueError("dim is required to create a new vector store")
+            self._size_files(INITIAL_CAPACITY, dim)
+            self._meta = np.memmap(self._paths["meta"], dtype=np.int64, mode="w+", shape=(4,))
+            self._meta[:] = (0, 0, dim, INITIAL_CAPACITY)
+            self._meta.flush()
+
+        self.dim = int(self._meta[DIM])
+        if not self._paths["codes"].exists():  # store written before the int8 copy existed
+            self._backfill_int8()
+        self._map()
+        n = int(self._meta[ROWS])
+        live = np.flatnonzero(self._ids[:n] != TOMBSTONE)
+        self._rows = dict(zip(self._ids[live].tolist(), live.tolist()))  # user_id -> row
+        self._dirty = False
+
+    def _size_files(self, capacity: int, dim: int):
+        for key, nbytes in (
+            ("vectors", capacity * dim * 4), ("ids", capacity * 8),
+            ("codes", capacity * dim), ("scales", capacity * 4),
+        ):
+            with open(self._paths[key], "ab") as f:
+                f.truncate(nbytes)  # sparse grow; existing rows untouched
+
+    def _map(self):
+        cap = int(self._meta[CAP])
+        self._vec = np.memmap(self._paths["vectors"], dtype=np.float32, mode="r+", shape=(cap, self.dim))
+        self._ids = np.memmap(self._paths["ids"], dtype=np.int64, mode="r+", shape=(cap,))
+        self._codes = np.memmap(self._paths["codes"], dtype=np.int8, mode="r+", shape=(cap, self.dim))
+        self._scales = np.memmap(self._paths["scales"], dtype=np.float32, mode="r+", shape=(cap,))
+
+    def _backfill_int8(self):
+        """Build the int8 copy of an existing store; codes.i8 appears (renamed) last."""
+        cap, n = int(self._meta[CAP]), int(self._meta[ROWS])
+        vec = np.memmap(self._paths["vectors"], dtype=np.float32, mode="r", shape=(cap, self.dim))
+        qv = QuantizedVectors.from_matrix(vec[:n], "int8")
+        for key, data, nbytes in (("scales", qv.scales, cap * 4), ("codes", qv.codes, cap * self.dim)):
+            tmp = self._paths[key].with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(data.tobytes())
+                f.truncate(nbytes)
+            os.replace(tmp, self._paths[key])
+        self._meta[GEN] += 1  # readers map the new files on their next access
+
+    def _ensure_capacity(self, needed: int):
+        cap = int(self._meta[CAP])
+        if needed <= cap:
+            return
+        new_cap = max(cap * 2, needed)
+        self.flush()
+        self._size_files(new_cap, self.dim)  # files grow BEFORE readers learn the new capacity
+        self._meta[CAP] = new_cap
+        self._dirty = True
+        self._map()
+
+    def upsert_many(self, user_ids, vectors) -> int:
+        """
+        Apply a batch (user_ids[N], vectors[N, dim]) with ONE generation bump.
+        Vectorized: normalize, diff against the stored rows, and write only the
+        rows that changed (unchanged rows are not dirtied). Returns rows written.
+        """
+        ids = np.asarray(user_ids, dtype=np.int64).reshape(-1)
+        mat = np.array(vectors, dtype=np.float32, ndmin=2)  # own copy: normalized in place
+        if mat.shape != (len(ids), self.dim):
+            raise ValueError(f"expected ({len(ids)}, {self.dim}) vectors, got {mat.shape}")
+        if not len(ids):
+            return 0
+        if np.any(ids == TOMBSTONE):
+            raise ValueError(f"user id {TOMBSTONE} is reserved")
+        _, last = np.unique(ids[::-1], return_index=True)  # same user twice: last one wins
+        keep = np.sort(len(ids) - 1 - last)
+        ids, mat = ids[keep], mat[keep]
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        mat /= norms
+
+        rows = np.fromiter((self._rows.get(u, -1) for u in ids.tolist()), dtype=np.int64, count=len(ids))
+        new = rows < 0
+        changed = new.copy()
+        changed[~new] = np.any(self._vec[rows[~new]] != mat[~new], axis=1)
+        if not changed.any():
+            return 0
+
+        n = int(self._meta[ROWS])
+        n_new = int(new.sum())
+        if n_new:
+            self._ensure_capacity(n + n_new)
+            rows[new] = np.arange(n, n + n_new)
+            self._ids[n:n + n_new] = ids[new]
+            self._rows.update(zip(ids[new].tolist(), range(n, n + n_new)))
+        rows, mat = rows[changed], mat[changed]
+        qv = QuantizedVectors.from_matrix(mat, "int8")
+        self._vec[rows] = mat
+        self._codes[rows] = qv.codes
+        self._scales[rows] = qv.scales
+        self._meta[ROWS] = n + n_new  # publish appended rows (data already in place)
+        self._meta[GEN] += 1          # readers pick this up on their next access
+        self._dirty = True
+        return len(rows)
+
+    def upsert(self, user_id: int, vector) -> None:
+        self.upsert_many([user_id], [vector])
+
+    def delete_many(self, user_ids) -> int:
+        """Tombstone these users' rows (unknown ids are ignored). Returns rows deleted."""
+        rows = [self._rows.pop(u) for u in user_ids if u in self._rows]
+        if not rows:
+            return 0
+        rows = np.asarray(rows, dtype=np.int64)
+        self._ids[rows] = TOMBSTONE  # first: readers stop resolving these users
+        self._vec[rows] = 0
+        self._codes[rows] = 0
+        self._scales[rows] = 1.0
+        self._meta[GEN] += 1
+        self._dirty = True
+        return len(rows)
+
+    def user_ids(self) -> list[int]:
+        """Ids of every live (non-deleted) row."""
+        return list(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def flush(self):
+        """msync to disk (other processes already see writes via the shared page cache).
+        A no-op when nothing was written since the last flush."""
+        if not self._dirty:
+            return
+        for mapped in (self._vec, self._ids, self._codes, self._scales, self._meta):
+            mapped.flush()
+        self._dirty = False
+
+    def close(self):
+        self.flush()
+        if fcntl is not None:
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
+        self._lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------------------
+# Reader (every API worker; read-only, zero-copy)
+# ------------------------------------------------------------------
+class VectorStoreReader:
+    def __init__(self, directory: str | Path = VECTOR_STORE_DIR):
+        self._paths = _paths(Path(directory))
+        self._meta = np.memmap(self._paths["meta"], dtype=np.int64, mode="r", shape=(4,))
+        self._gen = -1
+        self._cap = 0
+        self._codes = None
+        self._n = 0
+        self._index: dict[int, int] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Cheap when nothing changed: a single int compare."""
+        gen = int(self._meta[GEN])
+        if gen == self._gen:
+            return
+        cap = int(self._meta[CAP])
+        n = min(int(self._meta[ROWS]), cap)
+        dim = int(self._meta[DIM])
+        if cap != self._cap:  # writer grew the files: remap (old views stay valid until dropped)
+            self._vec = np.memmap(self._paths["vectors"], dtype=np.float32, mode="r", shape=(cap, dim))
+            self._ids = np.memmap(self._paths["ids"], dtype=np.int64, mode="r", shape=(cap,))
+        if (cap != self._cap or self._codes is None) and self._paths["codes"].exists():
+            self._codes = np.memmap(self._paths["codes"], dtype=np.int8, mode="r", shape=(cap, dim))
+            self._scales = np.memmap(self._paths["scales"], dtype=np.float32, mode="r", shape=(cap,))
+        self._cap = cap
+        if n > self._n:  # index only the appended rows
+            self._index.update(zip(self._ids[self._n:n].tolist(), range(self._n, n)))
+            self._n = n
+        self._gen = gen
+
+    @property
+    def generation(self) -> int:
+        return self._gen
+
+    def __len__(self) -> int:
+        self.refresh()
+        return self._n
+
+    def row_of(self, user_id: int) -> int | None:
+        self.refresh()
+        row = self._index.get(user_id)
+        if row is None or self._ids[row] != user_id:  # deleted (tombstoned) since it was indexed
+            return None
+        return row
+
+    def get(self, user_id: int) -> np.ndarray | None:
+        """Unit taste vector for a user (read-only view into the mapped file), or None."""
+        row = self.row_of(user_id)
+        return None if row is None else self._vec[row]
+
+    def matrix(self) -> np.ndarray:
+        """All current rows as one read-only [rows, dim] view — no copy."""
+        self.refresh()
+        return self._vec[:self._n]
+
+    def quantized(self) -> QuantizedVectors | None:
+        """The int8 copy of every current row (zero-copy view); None until a writer has built it."""
+        self.refresh()
+        if self._codes is None:
+            return None
+        return QuantizedVectors("int8", self._codes[:self._n], self._scales[:self._n])
+
+    def user_ids(self) -> np.ndarray:
+        """Id stored in each row (TOMBSTONE for deleted rows)."""
+        self.refresh()
+        return self._ids[:self._n]